@@ -1,15 +1,65 @@
 import requests
-from bs4 import BeautifulSoup
 import re
 import json
-import time
+import os
+import hashlib
+import threading
 from urllib.parse import urljoin
 from datetime import datetime
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from lxml import etree, html as lxml_html
+
+from gitlab_http import GitLabSession, RateLimiter, format_connection_stats
+
+
+def has_class(name):
+    """Predicado XPath equivalente ao class_= do BeautifulSoup: `name` entre as classes do elemento"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Consultas compiladas uma única vez; cada página só visita os elementos que usa
+LINK_HREFS = etree.XPath('//a/@href')
+ISSUE_TITLE = etree.XPath(f"//h1[{has_class('title')}]")
+ISSUE_DESCRIPTION = etree.XPath(f"//div[{has_class('description')}]")
+ISSUE_AUTHOR = etree.XPath(f"//span[{has_class('author')}]")
+ISSUE_TIMES = etree.XPath('//time[@datetime]')
+ISSUE_STATE = etree.XPath(f"//span[{has_class('state-badge')}]")
+ISSUE_LABELS = etree.XPath(f"//span[{has_class('badge')}]")
+TEXT_NODES = etree.XPath('.//text()')
+NEXT_PAGE_HREFS = etree.XPath(f"//link[@rel='next']/@href | //a[@rel='next']/@href | "
+                              f"//li[{has_class('next')}]/a/@href")
+ISSUE_PATTERN = re.compile(r'/issues/\d+$')
+
+
+def parse_html(html):
+    """Árvore do documento com o parser C do lxml"""
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # Texto com declaração de encoding (<?xml ...?>): o lxml exige bytes
+        return lxml_html.document_fromstring(html.encode('utf-8'))
+
+
+def element_text(element):
+    """Texto do elemento com cada trecho sem espaços nas pontas, como get_text(strip=True)"""
+    return ''.join(text.strip() for text in TEXT_NODES(element))
+
 
 class GitLabIssueExtractor:
-    def __init__(self, base_url="https://gitlab.com"):
+    def __init__(self, base_url="https://gitlab.com", concurrency=4, state_file=None):
         self.base_url = base_url
-        self.session = requests.Session()
+        # Páginas de issues buscadas em paralelo por extract_all_issues
+        self.concurrency = concurrency
+        # Estado entre execuções: {url da issue: {'etag', 'last_modified', 'sha1', 'data'}}
+        self.state_file = state_file
+        self.crawl_state = self.load_crawl_state()
+        self.crawl_stats = {'listing_pages': 0, 'parsed': 0, 'unchanged': 0}
+        self.lock = threading.Lock()
+        # Sessão compartilhada: pool keep-alive, compressão, retentativas e limite de taxa entre as threads
+        self.session = GitLabSession(pool_size=concurrency)
         # Adicionar headers para parecer mais com um browser real
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -25,30 +75,114 @@ class GitLabIssueExtractor:
             print(f"Erro ao buscar {url}: {e}")
             return None
 
+    def load_crawl_state(self):
+        """Issues raspadas em execuções anteriores, lidas de state_file"""
+        if not self.state_file or not Path(self.state_file).exists():
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('issues', {})
+        except (OSError, ValueError) as e:
+            print(f"[AVISO] Estado do crawler ilegível ({e}); raspando todas as issues")
+            return {}
+
+    def save_crawl_state(self):
+        """Grava o estado do crawler (arquivo temporário + rename, para não corromper o anterior)"""
+        if not self.state_file:
+            return
+        temporary = f"{self.state_file}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'issues': self.crawl_state}, f, ensure_ascii=False)
+        os.replace(temporary, self.state_file)
+
+    def count(self, name):
+        with self.lock:
+            self.crawl_stats[name] += 1
+
+    def parse_listing(self, html, page_url):
+        """Links das issues (sem repetições, na ordem da página) e das próximas páginas de uma listagem"""
+        tree = parse_html(html)
+        issue_links = dict.fromkeys(urljoin(self.base_url, href) for href in LINK_HREFS(tree)
+                                    if href and ISSUE_PATTERN.search(href))
+        next_pages = [urljoin(page_url, href) for href in NEXT_PAGE_HREFS(tree)]
+        return list(issue_links), next_pages
+
     def extract_issue_links_from_list(self, html):
         """Extrai os links das issues da página de listagem"""
-        soup = BeautifulSoup(html, 'html.parser')
-        issue_links = []
-        
-        # Procurar por links que apontam para issues específicas
-        issue_pattern = re.compile(r'/issues/\d+$')
-        
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if href and issue_pattern.search(href):
-                full_url = urljoin(self.base_url, href)
-                if full_url not in issue_links:
-                    issue_links.append(full_url)
+        return self.parse_listing(html, self.base_url)[0]
+
+    def iter_issue_links(self, issues_list_url, max_pages=None):
+        """Percorre a listagem seguindo a paginação (rel="next") e gera cada issue uma única vez
         
-        return issue_links
+        A fronteira é uma fila de páginas de listagem; páginas e issues já vistas ficam
+        em sets, então o custo é linear no número de links.
+        """
+        frontier = deque([issues_list_url])
+        visited_pages = set()
+        seen_issues = set()
+        while frontier and (max_pages is None or len(visited_pages) < max_pages):
+            page_url = frontier.popleft()
+            if page_url in visited_pages:
+                continue
+            visited_pages.add(page_url)
+            
+            print(f"Buscando página de issues: {page_url}")
+            html = self.fetch_page(page_url)
+            if not html:
+                continue
+            self.crawl_stats['listing_pages'] += 1
+            
+            issue_links, next_pages = self.parse_listing(html, page_url)
+            for issue_url in issue_links:
+                if issue_url not in seen_issues:
+                    seen_issues.add(issue_url)
+                    yield issue_url
+            frontier.extend(url for url in next_pages if url not in visited_pages)
+
+    def fetch_issue_page(self, issue_url, previous=None):
+        """GET da página da issue, condicional (ETag / Last-Modified) se ela já foi raspada"""
+        headers = {}
+        if previous:
+            if previous.get('etag'):
+                headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                headers['If-Modified-Since'] = previous['last_modified']
+        try:
+            response = self.session.get(issue_url, headers=headers)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            print(f"Erro ao buscar {issue_url}: {e}")
+            return None
 
     def extract_issue_details(self, issue_url):
-        """Extrai detalhes de uma issue específica"""
-        html = self.fetch_page(issue_url)
-        if not html:
+        """Extrai detalhes de uma issue específica
+        
+        Se a página não mudou desde a execução anterior (304, ou o mesmo conteúdo quando o
+        servidor não envia validadores), a issue salva no estado é reaproveitada sem parsing.
+        """
+        previous = self.crawl_state.get(issue_url)
+        response = self.fetch_issue_page(issue_url, previous)
+        if response is None:
             return None
+        if response.status_code == 304 and previous:
+            self.count('unchanged')
+            return previous['data']
         
-        soup = BeautifulSoup(html, 'html.parser')
+        digest = hashlib.sha1(response.content).hexdigest()
+        if previous and previous.get('sha1') == digest:
+            self.count('unchanged')
+            entry = previous
+        else:
+            self.count('parsed')
+            entry = {'sha1': digest, 'data': self.parse_issue_details(issue_url, response.text)}
+        entry.update(etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+        self.crawl_state[issue_url] = entry
+        return entry['data']
+
+    def parse_issue_details(self, issue_url, html):
+        """Extrai os campos da issue do HTML da página"""
+        tree = parse_html(html)
         
         # Estrutura básica do resultado
         issue_data = {
@@ -72,25 +206,24 @@ class GitLabIssueExtractor:
                 issue_data['id'] = id_match.group(1)
             
             # Extrair título
-            title_element = soup.find('h1', class_='title')
-            if title_element:
-                issue_data['title'] = title_element.get_text(strip=True)
+            title_elements = ISSUE_TITLE(tree)
+            if title_elements:
+                issue_data['title'] = element_text(title_elements[0])
             
             # Extrair descrição
-            desc_element = soup.find('div', class_='description')
-            if desc_element:
-                issue_data['description'] = desc_element.get_text(strip=True)
+            desc_elements = ISSUE_DESCRIPTION(tree)
+            if desc_elements:
+                issue_data['description'] = element_text(desc_elements[0])
             
             # Extrair autor
-            author_element = soup.find('span', class_='author')
-            if author_element:
-                author_link = author_element.find('a')
-                if author_link:
-                    issue_data['author'] = author_link.get_text(strip=True)
+            author_elements = ISSUE_AUTHOR(tree)
+            if author_elements:
+                author_link = author_elements[0].find('.//a')
+                if author_link is not None:
+                    issue_data['author'] = element_text(author_link)
             
             # Extrair datas (pode variar dependendo da estrutura da página)
-            time_elements = soup.find_all('time')
-            for time_elem in time_elements:
+            for time_elem in ISSUE_TIMES(tree):
                 datetime_attr = time_elem.get('datetime')
                 if datetime_attr:
                     if 'created' in time_elem.get('title', '').lower():
@@ -99,14 +232,13 @@ class GitLabIssueExtractor:
                         issue_data['updated_date'] = datetime_attr
             
             # Extrair estado
-            state_element = soup.find('span', class_='state-badge')
-            if state_element:
-                issue_data['state'] = state_element.get_text(strip=True)
+            state_elements = ISSUE_STATE(tree)
+            if state_elements:
+                issue_data['state'] = element_text(state_elements[0])
             
             # Extrair labels
-            label_elements = soup.find_all('span', class_='badge')
-            for label_elem in label_elements:
-                label_text = label_elem.get_text(strip=True)
+            for label_elem in ISSUE_LABELS(tree):
+                label_text = element_text(label_elem)
                 if label_text and label_text not in issue_data['labels']:
                     issue_data['labels'].append(label_text)
                     
@@ -115,32 +247,37 @@ class GitLabIssueExtractor:
         
         return issue_data
 
-    def extract_all_issues(self, issues_list_url, delay=1):
-        """Extrai informações de todas as issues da página de listagem"""
-        print(f"Buscando página de issues: {issues_list_url}")
-        html = self.fetch_page(issues_list_url)
+    def extract_all_issues(self, issues_list_url, delay=1, max_pages=None):
+        """Extrai informações de todas as issues da listagem, seguindo a paginação
         
-        if not html:
-            print("Erro: Não foi possível buscar a página de issues")
-            return []
-        
-        # Extrair links das issues
-        issue_links = self.extract_issue_links_from_list(html)
-        print(f"Encontradas {len(issue_links)} issues")
+        As páginas das issues são buscadas por um pool de `self.concurrency` threads
+        enquanto a listagem ainda é percorrida. `delay` é o intervalo mínimo entre
+        requisições, imposto a todas as threads pelo RateLimiter da sessão (0 mantém o
+        ritmo adaptativo pelos headers RateLimit-*). `max_pages` limita as páginas de
+        listagem. Com state_file, o estado é gravado ao final para a próxima execução.
+        """
+        if delay > 0:
+            self.session.rate_limiter = RateLimiter(initial_rate=1.0 / delay, burst=1, max_rate=1.0 / delay)
         
         all_issues = []
         
-        for i, issue_url in enumerate(issue_links, 1):
-            print(f"Processando issue {i}/{len(issue_links)}: {issue_url}")
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+            futures = [(issue_url, executor.submit(self.extract_issue_details, issue_url))
+                       for issue_url in self.iter_issue_links(issues_list_url, max_pages)]
             
-            issue_data = self.extract_issue_details(issue_url)
-            if issue_data:
-                all_issues.append(issue_data)
+            if not self.crawl_stats['listing_pages']:
+                print("Erro: Não foi possível buscar a página de issues")
+                return []
+            print(f"Encontradas {len(futures)} issues em {self.crawl_stats['listing_pages']} páginas")
             
-            # Delay para evitar sobrecarga do servidor
-            if delay > 0:
-                time.sleep(delay)
+            # Resultados na ordem da listagem
+            for i, (issue_url, future) in enumerate(futures, 1):
+                issue_data = future.result()
+                print(f"Processada issue {i}/{len(futures)}: {issue_url}")
+                if issue_data:
+                    all_issues.append(issue_data)
         
+        self.save_crawl_state()
         return all_issues
 
     def save_to_json(self, issues_data, filename):
@@ -152,6 +289,16 @@ class GitLabIssueExtractor:
         except Exception as e:
             print(f"Erro ao salvar arquivo: {e}")
 
+    def print_crawl_summary(self):
+        """Imprime páginas de listagem percorridas e issues raspadas ou reaproveitadas"""
+        stats = self.crawl_stats
+        print(f"[CRAWL] {stats['listing_pages']} páginas de listagem; {stats['parsed']} issues raspadas, "
+              f"{stats['unchanged']} inalteradas desde a última execução")
+
+    def print_connection_summary(self):
+        """Imprime o reuso de conexões HTTP da execução"""
+        print(format_connection_stats(self.session.connection_stats()))
+
     def print_summary(self, issues_data):
         """Imprime um resumo das issues extraídas"""
         print(f"\n=== RESUMO ===")
@@ -168,7 +315,7 @@ if __name__ == "__main__":
     issues_url = "https://gitlab.com/raidiam-conformance/open-finance/certification/-/issues?sort=created_date&state=opened&first_page_size=50"
     
     # Criar extrator
-    extractor = GitLabIssueExtractor()
+    extractor = GitLabIssueExtractor(state_file="scraper-state.json")
     
     # Extrair todas as issues
     issues = extractor.extract_all_issues(issues_url, delay=2)  # 2 segundos de delay entre requests
@@ -181,5 +328,7 @@ if __name__ == "__main__":
         
         # Mostrar resumo
         extractor.print_summary(issues)
+        extractor.print_crawl_summary()
+        extractor.print_connection_summary()
     else:
         print("Nenhuma issue foi extraída.")
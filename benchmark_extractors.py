@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Benchmark dos extratores
+Sobe um servidor local que imita a API do GitLab (issues e notas) e as páginas HTML de issues,
+e mede GitLabIssuesExtractor, GitLabAPIExtractor e o scraper de app.py contra ele
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import queue
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PROJECT_PATH = 'bench/project'
+LABELS = ['bug', 'enhancement', 'documentation', 'prio::high', 'prio::low', 'team::api', 'team::web']
+
+
+class FakeGitLabData:
+    """Issues e notas sintéticas, geradas de forma determinística"""
+
+    def __init__(self, issue_count=500, comments_per_issue=5):
+        rng = random.Random(42)
+        self.comments_per_issue = comments_per_issue
+        self.issues = []
+        for iid in range(issue_count, 0, -1):
+            user_notes = rng.randint(0, comments_per_issue * 2) if comments_per_issue else 0
+            self.issues.append({
+                'id': 100000 + iid, 'iid': iid, 'project_id': 1,
+                'title': f"Issue de benchmark {iid}", 'description': f"Descrição da issue {iid}. " * 10,
+                'state': 'closed' if iid % 3 == 0 else 'opened',
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(1700000000 + iid * 3600)),
+                'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(1700000000 + iid * 3700)),
+                'closed_at': None, 'labels': rng.sample(LABELS, 2), 'milestone': None,
+                'assignees': [{'name': f"Pessoa {iid % 7}", 'username': f"pessoa{iid % 7}"}],
+                'author': {'name': f"Autor {iid % 11}", 'username': f"autor{iid % 11}"},
+                'web_url': f"https://gitlab.example/{PROJECT_PATH}/-/issues/{iid}",
+                'references': {'short': f"#{iid}", 'relative': f"#{iid}", 'full': f"{PROJECT_PATH}#{iid}"},
+                'time_stats': {'time_estimate': 0, 'total_time_spent': 0, 'human_time_estimate': None,
+                               'human_total_time_spent': None},
+                'confidential': False, 'discussion_locked': None, 'due_date': None, 'has_tasks': False,
+                'task_status': '0 of 0 checklist items completed', 'weight': None,
+                'user_notes_count': user_notes, 'merge_requests_count': 0, 'upvotes': iid % 4, 'downvotes': 0
+            })
+        self.by_iid = {issue['iid']: issue for issue in self.issues}
+
+    def notes(self, iid):
+        """Notas de uma issue: as de usuário e uma nota de sistema a cada três"""
+        issue = self.by_iid.get(iid)
+        if issue is None:
+            return []
+        notes = []
+        for index in range(issue['user_notes_count'] + issue['user_notes_count'] // 3):
+            notes.append({
+                'id': iid * 1000 + index, 'body': f"Comentário {index} da issue {iid}",
+                'system': index >= issue['user_notes_count'],
+                'author': {'name': f"Pessoa {index % 5}", 'username': f"pessoa{index % 5}"},
+                'created_at': issue['created_at'], 'updated_at': issue['updated_at'],
+                'resolvable': False, 'resolved': None
+            })
+        return notes
+
+
+class FakeGitLabHandler(BaseHTTPRequestHandler):
+    """Endpoints /api/v4/projects/:id/issues, .../issues/:iid, .../notes e as páginas HTML de issues"""
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo saem em escritas separadas: com Nagle + delayed ACK cada resposta
+    # em conexão reaproveitada esperaria ~40ms, distorcendo as medições
+    disable_nagle_algorithm = True
+
+    API_ISSUES = re.compile(r'^/api/v4/projects/([^/]+)/issues(?:/(\d+)(/notes)?)?$')
+    HTML_ISSUES = re.compile(r'^/(.+)/-/issues(?:/(\d+))?$')
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        rate_headers = server.consume_budget()
+
+        if rate_headers is None:
+            self.respond(429, b'', {'Retry-After': str(server.window)})
+            return
+        if server.error_rate and server.rng.random() < server.error_rate:
+            server.count('errors')
+            self.respond(502, b'', rate_headers)
+            return
+
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        api_match = self.API_ISSUES.match(url.path)
+        html_match = self.HTML_ISSUES.match(url.path)
+
+        if api_match and api_match.group(3):
+            items = server.data.notes(int(api_match.group(2)))
+            if query.get('activity_filter') == 'only_comments':
+                items = [note for note in items if not note['system']]
+            if query.get('sort') == 'desc':
+                items = items[::-1]
+            self.respond_page(items, query, rate_headers)
+        elif api_match and api_match.group(2):
+            issue = server.data.by_iid.get(int(api_match.group(2)))
+            if issue is None:
+                self.respond(404, b'{"message":"404 Not found"}', rate_headers)
+            else:
+                self.respond_json(issue, rate_headers)
+        elif api_match:
+            items = server.data.issues
+            if query.get('state', 'all') != 'all':
+                items = [issue for issue in items if issue['state'] == query['state']]
+            if query.get('sort') == 'asc':
+                items = items[::-1]
+            self.respond_page(items, query, rate_headers)
+        elif html_match and html_match.group(2):
+            issue = server.data.by_iid.get(int(html_match.group(2)))
+            etag = f'W/"{issue["updated_at"]}"' if issue else None
+            if issue is None:
+                self.respond(404, b'Not found', rate_headers)
+            elif self.headers.get('If-None-Match') == etag:
+                self.respond(304, b'', dict(rate_headers, ETag=etag))
+            else:
+                self.respond(200, self.issue_html(issue).encode('utf-8'),
+                             dict(rate_headers, **{'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}))
+        elif html_match:
+            # Listagem paginada como a do GitLab: 20 issues por página e link rel="next"
+            page = int(query.get('page', 1))
+            issues = server.data.issues[(page - 1) * 20:page * 20]
+            links = ''.join(f'<li><a href="/{html_match.group(1)}/-/issues/{issue["iid"]}">{issue["title"]}</a></li>'
+                            for issue in issues)
+            if page * 20 < len(server.data.issues):
+                links += f'<li class="next"><a rel="next" href="?page={page + 1}">Próxima</a></li>'
+            body = f"<html><body><ul class=\"issues-list\">{links}</ul></body></html>"
+            self.respond(200, body.encode('utf-8'), dict(rate_headers, **{'Content-Type': 'text/html; charset=utf-8'}))
+        else:
+            self.respond(404, b'', rate_headers)
+
+    def issue_html(self, issue):
+        labels = ''.join(f'<span class="badge">{label}</span>' for label in issue['labels'])
+        return (
+            f"<html><body><h1 class=\"title\">{issue['title']}</h1>"
+            f"<span class=\"author\"><a href=\"/{issue['author']['username']}\">{issue['author']['name']}</a></span>"
+            f"<time datetime=\"{issue['created_at']}\" title=\"Created\"></time>"
+            f"<time datetime=\"{issue['updated_at']}\" title=\"Updated\"></time>"
+            f"<span class=\"state-badge\">{issue['state']}</span>{labels}"
+            f"<div class=\"description\">{issue['description']}</div></body></html>"
+        )
+
+    def respond_page(self, items, query, rate_headers):
+        """Paginação offset (X-Next-Page, X-Total-Pages) ou keyset (Link rel=next)"""
+        per_page = min(int(query.get('per_page', 20)), 100)
+        page = int(query.get('cursor', query.get('page', 1)))
+        total_pages = max(1, -(-len(items) // per_page))
+        headers = dict(rate_headers, **{'X-Total': str(len(items)), 'X-Total-Pages': str(total_pages),
+                                        'X-Per-Page': str(per_page), 'X-Page': str(page)})
+        if query.get('pagination') == 'keyset':
+            if page < total_pages:
+                next_query = dict(query, cursor=page + 1)
+                headers['Link'] = f'<http://{self.headers["Host"]}{urlparse(self.path).path}?{urlencode(next_query)}>; rel="next"'
+        else:
+            headers['X-Next-Page'] = str(page + 1) if page < total_pages else ''
+        self.respond_json(items[(page - 1) * per_page:page * per_page], headers)
+
+    def respond_json(self, payload, headers):
+        self.respond(200, json.dumps(payload).encode('utf-8'), dict(headers, **{'Content-Type': 'application/json'}))
+
+    def respond(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(len(body))
+
+
+class FakeGitLabServer(ThreadingHTTPServer):
+    """Servidor local com latência, orçamento de rate limit por janela e taxa de erros configuráveis"""
+
+    daemon_threads = True
+
+    def __init__(self, data, latency=0.01, budget=None, window=10, error_rate=0.0, port=0):
+        super().__init__(('127.0.0.1', port), FakeGitLabHandler)
+        self.data = data
+        self.latency = latency
+        self.budget = budget
+        self.window = window
+        self.error_rate = error_rate
+        self.rng = random.Random(7)
+        self.lock = threading.Lock()
+        self.window_start = 0
+        self.window_requests = 0
+        self.stats = {'requests': 0, 'bytes': 0, 'throttled': 0, 'errors': 0}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def consume_budget(self):
+        """Headers RateLimit-* da requisição, ou None se o orçamento da janela acabou (429)"""
+        with self.lock:
+            now = time.time()
+            window_start = int(now // self.window * self.window)
+            if window_start != self.window_start:
+                self.window_start, self.window_requests = window_start, 0
+            self.window_requests += 1
+            self.stats['requests'] += 1
+            if self.budget is None:
+                return {}
+            remaining = self.budget - self.window_requests
+            if remaining < 0:
+                self.stats['throttled'] += 1
+                return None
+            return {'RateLimit-Limit': str(self.budget), 'RateLimit-Remaining': str(remaining),
+                    'RateLimit-Reset': str(window_start + self.window)}
+
+    def record(self, size):
+        with self.lock:
+            self.stats['bytes'] += size
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+def peak_rss_mib():
+    """Pico de memória residente do processo atual em MiB (None se indisponível)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em KiB nos demais sistemas
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_unified(base_url, options):
+    from gitlab_extractor_unified import GitLabIssuesExtractor
+    with tempfile.TemporaryDirectory() as output_dir:
+        extractor = GitLabIssuesExtractor(base_url, output_base_dir=output_dir, pool_size=options['concurrency'])
+        issues = extractor.extract_all_issues(
+            PROJECT_PATH, state='all', max_pages=None, include_comments=options['comments'],
+            concurrency=options['concurrency'], pagination=options['pagination']
+        )
+    return len(issues)
+
+
+def run_api(base_url, options):
+    from gitlab_api_extractor import GitLabAPIExtractor
+    extractor = GitLabAPIExtractor(base_url)
+    return len(extractor.extract_all_issues_detailed(PROJECT_PATH, state='all', max_pages=10 ** 6))
+
+
+def run_scraper(base_url, options):
+    from app import GitLabIssueExtractor
+    extractor = GitLabIssueExtractor(base_url)
+    return len(extractor.extract_all_issues(f"{base_url}/{PROJECT_PATH}/-/issues", delay=0))
+
+
+RUNNERS = {'unified': run_unified, 'api': run_api, 'scraper': run_scraper}
+
+
+def run_scenario(target, base_url, options, results):
+    """Executa um cenário (em processo separado, para isolar o pico de RSS)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        count = RUNNERS[target](base_url, options)
+    results.put({'issues': count, 'seconds': time.perf_counter() - start, 'peak_rss_mib': peak_rss_mib()})
+
+
+def wait_measurement(process, results_queue, timeout):
+    """Resultado do cenário, ou None se o processo terminar sem resultado ou estourar o tempo"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return results_queue.get(timeout=0.5)
+        except queue.Empty:
+            if not process.is_alive():
+                return None
+    process.terminate()
+    return None
+
+
+def build_scenarios(args):
+    scenarios = []
+    for target in args.targets.split(','):
+        if target == 'unified':
+            for concurrency in (int(value) for value in args.concurrency.split(',')):
+                for pagination in args.pagination.split(','):
+                    scenarios.append((f"unified c={concurrency} {pagination}", target,
+                                      {'concurrency': concurrency, 'pagination': pagination,
+                                       'comments': not args.no_comments}))
+        elif target in RUNNERS:
+            scenarios.append((target, target, {}))
+        else:
+            raise SystemExit(f"Alvo desconhecido: {target} (use {', '.join(RUNNERS)})")
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos extratores contra uma API GitLab local')
+    parser.add_argument('--issues', '-n', type=int, default=500, help='Número de issues (default: 500)')
+    parser.add_argument('--comments', type=int, default=5, help='Média de comentários por issue (default: 5)')
+    parser.add_argument('--latency', type=float, default=0.01, help='Latência por requisição em segundos (default: 0.01)')
+    parser.add_argument('--budget', type=int, default=2000,
+                        help='Requisições permitidas por janela de rate limit, anunciadas nos headers RateLimit-* '
+                             '(default: 2000; 0 = sem limite e sem headers)')
+    parser.add_argument('--window', type=int, default=10, help='Duração da janela de rate limit em segundos (default: 10)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de respostas 502 (default: 0)')
+    parser.add_argument('--targets', default='unified,api,scraper',
+                        help='Extratores a medir: unified, api, scraper (default: todos)')
+    parser.add_argument('--concurrency', default='1,4', help='Concorrências do extrator unificado (default: 1,4)')
+    parser.add_argument('--pagination', default='offset,keyset', help='Paginações do extrator unificado (default: ambas)')
+    parser.add_argument('--no-comments', action='store_true', help='Extrator unificado sem comentários')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Tempo máximo de cada cenário em segundos (default: 600)')
+    parser.add_argument('--json', dest='json_path', help='Grava os resultados em JSON neste arquivo')
+    args = parser.parse_args()
+
+    server = FakeGitLabServer(FakeGitLabData(args.issues, args.comments), latency=args.latency, budget=args.budget or None,
+                              window=args.window, error_rate=args.error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    print(f"Servidor falso em {server.base_url}: {args.issues} issues, latência {args.latency}s, "
+          f"orçamento {args.budget or 'ilimitado'}, erros {args.error_rate:.0%}\n")
+    print(f"{'Cenário':<26}{'Issues':>8}{'Tempo (s)':>11}{'Issues/s':>10}{'Requisições':>13}"
+          f"{'MiB transf.':>13}{'429/502':>9}{'RSS pico':>10}")
+
+    for name, target, options in build_scenarios(args):
+        before = server.snapshot()
+        results_queue = context.Queue()
+        process = context.Process(target=run_scenario, args=(target, server.base_url, options, results_queue))
+        process.start()
+        measurement = wait_measurement(process, results_queue, args.timeout)
+        process.join()
+        after = server.snapshot()
+        if measurement is None:
+            print(f"{name:<26}[ERRO] cenário falhou (exit code {process.exitcode})")
+            continue
+
+        result = dict(measurement, scenario=name,
+                      **{key: after[key] - before[key] for key in ('requests', 'bytes', 'throttled', 'errors')})
+        results.append(result)
+        rss = f"{result['peak_rss_mib']:.0f} MiB" if result['peak_rss_mib'] else '-'
+        print(f"{name:<26}{result['issues']:>8}{result['seconds']:>11.2f}"
+              f"{result['issues'] / result['seconds']:>10.1f}{result['requests']:>13}"
+              f"{result['bytes'] / 2 ** 20:>13.2f}{result['throttled']:>5}/{result['errors']:<3}{rss:>10}")
+
+    server.shutdown()
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n[OK] Resultados salvos em: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
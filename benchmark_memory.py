@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Benchmark de memória
+Compara a memória retida por issues normalizadas como dicts (representação anterior)
+e como objetos Issue/Comment com __slots__ e strings internadas
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from gitlab_extractor_unified import GitLabIssuesExtractor
+
+
+STATES = ['opened', 'closed']
+LABELS = ['bug', 'enhancement', 'documentation', 'prio::high', 'prio::low', 'team::api', 'team::web', 'wontfix']
+PEOPLE = [(f"Pessoa {i}", f"pessoa{i}") for i in range(40)]
+
+
+def build_api_page(start, count, comments_per_issue):
+    """Gera o texto JSON de uma página da API (issues e notas), como viria de response.text"""
+    rng = random.Random(start)
+    issues = []
+    for i in range(start, start + count):
+        name, username = rng.choice(PEOPLE)
+        milestone_id = i % 5
+        issues.append({
+            'id': 100000 + i, 'iid': i, 'title': f"Issue {i}", 'description': f"Descrição da issue {i}. " * 5,
+            'state': rng.choice(STATES), 'created_at': f"2024-01-01T00:00:{i % 60:02d}.000Z",
+            'updated_at': f"2024-02-01T00:00:{i % 60:02d}.000Z", 'closed_at': None,
+            'labels': rng.sample(LABELS, 3),
+            'milestone': {'id': milestone_id, 'iid': milestone_id, 'title': f"Sprint {milestone_id}",
+                          'description': '', 'state': 'active', 'due_date': None, 'start_date': None,
+                          'web_url': f"https://gitlab.com/g/p/-/milestones/{milestone_id}"},
+            'assignees': [{'name': name, 'username': username}],
+            'author': {'name': name, 'username': username},
+            'web_url': f"https://gitlab.com/g/p/-/issues/{i}",
+            'references': {'short': f"#{i}", 'relative': f"#{i}", 'full': f"g/p#{i}"},
+            'time_stats': {'time_estimate': 0, 'total_time_spent': 0, 'human_time_estimate': None,
+                           'human_total_time_spent': None},
+            'confidential': False, 'discussion_locked': None, 'due_date': None, 'has_tasks': False,
+            'task_status': '0 of 0 checklist items completed', 'weight': None,
+            'user_notes_count': comments_per_issue, 'merge_requests_count': 0, 'upvotes': 0, 'downvotes': 0,
+            'notes': [{'id': i * 100 + j, 'body': f"Comentário {j}", 'system': False,
+                       'author': dict(zip(('name', 'username'), rng.choice(PEOPLE))),
+                       'created_at': '2024-03-01T00:00:00.000Z', 'updated_at': '2024-03-01T00:00:00.000Z',
+                       'resolvable': False, 'resolved': None}
+                      for j in range(comments_per_issue)]
+        })
+    return json.dumps(issues)
+
+
+def build_issue_dict(issue):
+    """Normalização anterior: um dict de 27 chaves por issue e dicts de 8 chaves por comentário"""
+    return {
+        'id': issue.get('id'), 'iid': issue.get('iid'), 'title': issue.get('title'),
+        'description': issue.get('description'), 'state': issue.get('state'),
+        'created_at': issue.get('created_at'), 'updated_at': issue.get('updated_at'),
+        'closed_at': issue.get('closed_at'), 'labels': issue.get('labels', []),
+        'milestone': issue.get('milestone'),
+        'assignees': [assignee.get('name') for assignee in issue.get('assignees', [])],
+        'author': issue.get('author', {}).get('name'), 'author_username': issue.get('author', {}).get('username'),
+        'web_url': issue.get('web_url'), 'references': issue.get('references'),
+        'time_stats': issue.get('time_stats'), 'confidential': issue.get('confidential'),
+        'discussion_locked': issue.get('discussion_locked'), 'due_date': issue.get('due_date'),
+        'has_tasks': issue.get('has_tasks'), 'task_status': issue.get('task_status'), 'weight': issue.get('weight'),
+        'user_notes_count': issue.get('user_notes_count', 0),
+        'merge_requests_count': issue.get('merge_requests_count', 0),
+        'upvotes': issue.get('upvotes', 0), 'downvotes': issue.get('downvotes', 0),
+        'comments': [{
+            'id': note.get('id'), 'body': note.get('body'), 'author': note.get('author', {}).get('name'),
+            'author_username': note.get('author', {}).get('username'), 'created_at': note.get('created_at'),
+            'updated_at': note.get('updated_at'), 'resolvable': note.get('resolvable'),
+            'resolved': note.get('resolved')
+        } for note in issue['notes'] if not note.get('system', False)]
+    }
+
+
+def build_issue_model(extractor, issue):
+    """Normalização atual: Issue/Comment com __slots__ e strings internadas"""
+    issue_data = extractor.build_issue_data(issue)
+    issue_data.comments = extractor.build_comments_data(issue['notes'])
+    return issue_data
+
+
+def measure(pages, build):
+    """Memória retida (bytes) pelas issues normalizadas depois de descartar as respostas da API"""
+    gc.collect()
+    tracemalloc.start()
+    issues = []
+    for page_text in pages:
+        issues.extend(build(issue) for issue in json.loads(page_text))
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(issues), retained, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de memória da representação das issues')
+    parser.add_argument('--issues', '-n', type=int, default=20000, help='Número de issues (default: 20000)')
+    parser.add_argument('--comments', '-c', type=int, default=5, help='Comentários por issue (default: 5)')
+    parser.add_argument('--per-page', type=int, default=100, help='Issues por página simulada (default: 100)')
+    args = parser.parse_args()
+
+    pages = [build_api_page(start, min(args.per_page, args.issues - start), args.comments)
+             for start in range(0, args.issues, args.per_page)]
+    extractor = GitLabIssuesExtractor(output_base_dir='reports')
+
+    results = [
+        ('dict (anterior)', measure(pages, build_issue_dict)),
+        ('Issue/Comment (__slots__)', measure(pages, lambda issue: build_issue_model(extractor, issue)))
+    ]
+
+    baseline = results[0][1][1]
+    print(f"{args.issues} issues, {args.comments} comentários por issue\n")
+    print(f"{'Representação':<28}{'Retida (MiB)':>14}{'Pico (MiB)':>12}{'Bytes/issue':>13}{'Economia':>10}")
+    for name, (count, retained, peak) in results:
+        savings = (1 - retained / baseline) * 100 if baseline else 0.0
+        print(f"{name:<28}{retained / 2**20:>14.1f}{peak / 2**20:>12.1f}{retained / max(count, 1):>13.0f}"
+              f"{savings:>9.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
-import json
+from contextlib import nullcontext
 from datetime import datetime
+from pathlib import Path
+
+from gitlab_writers import load_issues_file
 
 def create_summary_report(json_filename):
     """
     Cria um relatório resumido das issues extraídas
     """
     try:
-        with open(json_filename, 'r', encoding='utf-8') as f:
-            issues = json.load(f)
+        issues = load_issues_file(json_filename)
     except FileNotFoundError:
         print(f"Arquivo {json_filename} não encontrado!")
         return
@@ -112,8 +114,7 @@ def create_csv_export(json_filename):
     Cria um arquivo CSV com os dados das issues
     """
     try:
-        with open(json_filename, 'r', encoding='utf-8') as f:
-            issues = json.load(f)
+        issues = load_issues_file(json_filename)
     except FileNotFoundError:
         print(f"Arquivo {json_filename} não encontrado!")
         return
@@ -160,17 +161,38 @@ def create_csv_export(json_filename):
     return csv_filename
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Gera relatório resumido e CSV a partir de um JSON ou JSON Lines de issues')
     # Nome do arquivo JSON gerado anteriormente
-    json_file = "gitlab_issues_20250930_174541.json"
+    parser.add_argument('json_file', nargs='?', default="gitlab_issues_20250930_174541.json",
+                        help='Arquivo JSON ou JSON Lines (.ndjson, .ndjson.gz, .ndjson.zst) de issues '
+                             '(default: gitlab_issues_20250930_174541.json)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Perfila cada relatório com cProfile e tracemalloc e grava em profile/<data-hora>')
+    args = parser.parse_args()
+    json_file = args.json_file
+    
+    profiler = None
+    if args.profile:
+        from gitlab_profiling import PhaseProfiler
+        profiler = PhaseProfiler(Path('profile') / datetime.now().strftime("%Y-%m-%d-%H%M%S"))
+    
+    def phase(name):
+        return profiler.phase(name) if profiler else nullcontext()
     
     print("Gerando relatórios adicionais...")
     
     # Criar relatório resumido
-    summary_file = create_summary_report(json_file)
+    with phase('create_summary_report'):
+        summary_file = create_summary_report(json_file)
     
     # Criar exportação CSV
-    csv_file = create_csv_export(json_file)
+    with phase('create_csv_export'):
+        csv_file = create_csv_export(json_file)
     
     print("\n✅ Relatórios gerados com sucesso!")
     print(f"📊 Resumo: {summary_file}")
-    print(f"📈 CSV: {csv_file}")
\ No newline at end of file
+    print(f"📈 CSV: {csv_file}")
+    if profiler:
+        print(f"⏱️ Perfis: {profiler.write()}")
@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import json
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -12,6 +11,8 @@ import numpy as np
 from collections import Counter
 import re
 
+from gitlab_writers import load_issues_file
+
 # Configuração da página
 st.set_page_config(
     page_title="GitLab Issues Dashboard",
@@ -67,22 +68,18 @@ class GitLabDashboard:
         self.extractor_script = "gitlab_extractor_unified.py"
     
     def get_latest_json_file(self):
-        """Encontra o arquivo JSON mais recente"""
-        json_dir = self.reports_dir / "json"
-        if not json_dir.exists():
-            return None
-        
-        json_files = list(json_dir.glob("*.json"))
+        """Encontra o arquivo de dados mais recente (JSON ou JSON Lines)"""
+        json_files = list((self.reports_dir / "json").glob("*.json"))
+        json_files += (self.reports_dir / "ndjson").glob("*.ndjson*")
         if not json_files:
             return None
         
         return max(json_files, key=lambda x: x.stat().st_mtime)
     
     def load_issues_data(self, file_path):
-        """Carrega dados das issues do arquivo JSON"""
+        """Carrega dados das issues do arquivo JSON ou JSON Lines"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_issues_file(file_path)
             
             # Converter para DataFrame
             df = pd.DataFrame(data)
@@ -327,7 +324,7 @@ def main():
         with st.expander("Configurações de Saída"):
             output_format = st.selectbox(
                 "Formato de Saída",
-                ["json", "csv", "markdown", "summary", "all"],
+                ["json", "ndjson", "csv", "markdown", "summary", "all"],
                 index=0,
                 help="Formatos de arquivo para gerar"
             )
@@ -588,7 +585,7 @@ def main():
         reports_dir = Path("reports")
         
         if reports_dir.exists():
-            for folder_name in ["json", "csv", "markdown", "summary"]:
+            for folder_name in ["json", "ndjson", "csv", "markdown", "summary"]:
                 folder_path = reports_dir / folder_name
                 
                 if folder_path.exists():
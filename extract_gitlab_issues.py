@@ -6,7 +6,6 @@ Extrai informações de issues do GitLab usando a API pública
 
 import requests
 import json
-import time
 import argparse
 from datetime import datetime
 from urllib.parse import quote
@@ -26,13 +25,16 @@ def main():
                        help='Número máximo de páginas a processar (default: 5)')
     parser.add_argument('--delay', '-d', 
                        type=float, 
-                       default=1.0,
-                       help='Delay em segundos entre requests (default: 1.0)')
+                       help='Intervalo mínimo em segundos entre requests (default: ritmo ajustado pelos '
+                            'headers RateLimit-* do GitLab)')
     parser.add_argument('--output', '-o', 
                        help='Nome base dos arquivos de saída (default: gitlab_issues_TIMESTAMP)')
     parser.add_argument('--no-comments', 
                        action='store_true',
                        help='Não tentar buscar comentários das issues')
+    parser.add_argument('--no-cache',
+                       action='store_true',
+                       help='Não usar o cache HTTP em disco (.http-cache)')
     parser.add_argument('--verbose', '-v', 
                        action='store_true',
                        help='Modo verboso')
@@ -48,14 +50,15 @@ def main():
     
     # Criar extrator com configurações
     from gitlab_api_extractor import GitLabAPIExtractor
-    extractor = GitLabAPIExtractor()
+    extractor = GitLabAPIExtractor(max_rate=1.0 / args.delay if args.delay else None,
+                                   cache_dir=None if args.no_cache else '.http-cache')
     
     if args.verbose:
         print(f"Configurações:")
         print(f"  Projeto: {args.project}")
         print(f"  Estado: {args.state}")
         print(f"  Páginas máximas: {args.pages}")
-        print(f"  Delay: {args.delay}s")
+        print(f"  Delay: {f'{args.delay}s' if args.delay else 'adaptativo'}")
         print(f"  Buscar comentários: {not args.no_comments}")
         print(f"  Arquivo base: {output_base}")
         print()
@@ -119,7 +122,6 @@ def main():
                     break
                     
                 page += 1
-                time.sleep(args.delay)
             
             return all_issues
         
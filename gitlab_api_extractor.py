@@ -1,19 +1,26 @@
 import requests
 import json
-import time
 from datetime import datetime
 from urllib.parse import quote
 
+from gitlab_http import RateLimiter, GitLabSession, HTTPCache, format_connection_stats
+
 class GitLabAPIExtractor:
-    def __init__(self, base_url="https://gitlab.com"):
+    def __init__(self, base_url="https://gitlab.com", max_rate=None, cache_dir=None):
         self.base_url = base_url
         self.api_url = f"{base_url}/api/v4"
-        self.session = requests.Session()
+        # Ritmo, timeouts e retentativas das requisições controlados pela sessão compartilhada
+        cache = HTTPCache(cache_dir) if cache_dir else None
+        self.session = GitLabSession(RateLimiter(max_rate=max_rate), cache=cache)
         # Headers para parecer mais com um browser real
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
+    def print_connection_summary(self):
+        """Imprime o reuso de conexões HTTP da execução"""
+        print(format_connection_stats(self.session.connection_stats()))
+
     def get_project_issues(self, project_path, state='opened', per_page=50, page=1):
         """
         Busca issues de um projeto usando a API pública do GitLab
@@ -145,9 +152,6 @@ class GitLabAPIExtractor:
                             'resolved': comment.get('resolved')
                         }
                         issue_data['comments'].append(comment_data)
-                    
-                    # Pequeno delay para não sobrecarregar a API
-                    time.sleep(0.5)
                 
                 all_issues.append(issue_data)
             
@@ -156,7 +160,6 @@ class GitLabAPIExtractor:
                 break
                 
             page += 1
-            time.sleep(1)  # Delay entre páginas
         
         return all_issues
 
@@ -278,5 +281,7 @@ if __name__ == "__main__":
         print(f"JSON: {json_filename}")
         print(f"Markdown: {md_filename}")
         
+        extractor.print_connection_summary()
+        
     else:
         print("Nenhuma issue foi extraída.")
\ No newline at end of file
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Engine assíncrona
+Implementa o mesmo contrato do GitLabIssuesExtractor usando aiohttp e um único event loop
+"""
+
+import asyncio
+import json
+import time
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp é opcional (pip install aiohttp)
+    aiohttp = None
+
+from gitlab_extractor_unified import GitLabIssuesExtractor
+from gitlab_http import RETRY_STATUS_CODES, backoff_delay, next_link_from_headers
+
+
+class AsyncGitLabIssuesExtractor(GitLabIssuesExtractor):
+    """Versão assíncrona do extrator: as buscas são corrotinas e os métodos de saída são herdados"""
+
+    def __init__(self, base_url="https://gitlab.com", output_base_dir="reports", max_rate=None,
+                 max_retries=3, timeout=(5, 30), cache_dir=None, cache_max_bytes=200 * 1024 * 1024,
+                 pool_size=10):
+        if aiohttp is None:
+            raise ImportError("A engine assíncrona requer o pacote 'aiohttp' (pip install aiohttp)")
+        super().__init__(base_url=base_url, output_base_dir=output_base_dir, max_rate=max_rate,
+                         max_retries=max_retries, timeout=timeout, cache_dir=cache_dir,
+                         cache_max_bytes=cache_max_bytes, pool_size=pool_size)
+        self.http = None
+        self.semaphore = None
+        self.async_connection_stats = {'requests': 0, 'connections': 0}
+
+    def connection_stats(self):
+        """Estatísticas de reuso de conexões coletadas pelo TraceConfig do aiohttp"""
+        return dict(self.async_connection_stats)
+
+    def build_trace_config(self):
+        """TraceConfig que conta requisições e conexões novas"""
+        stats = self.async_connection_stats
+
+        async def on_request_start(session, context, params):
+            stats['requests'] += 1
+
+        async def on_connection_create_end(session, context, params):
+            stats['connections'] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    async def fetch_json(self, url, params=None):
+        """GET limitado pelo RateLimiter compartilhado; retorna (json, headers, link da próxima página)
+
+        Usa a mesma política de retentativas da GitLabSession: erros de rede, timeouts e
+        status transitórios são repetidos com backoff exponencial e jitter. Esgotadas as
+        tentativas, o erro é propagado (ClientResponseError para status HTTP). Com cache
+        HTTP, a requisição é condicional e um 304 é servido a partir do cache.
+        """
+        max_retries = self.session.max_retries
+        cache_url = entry = None
+        headers = {}
+        if self.cache is not None:
+            cache_url = self.cache.request_url(url, params)
+            entry = self.cache.lookup(cache_url)
+            if entry:
+                headers = self.cache.conditional_headers(entry)
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.rate_limiter.reserve())
+            sent = time.perf_counter()
+            try:
+                async with self.semaphore:
+                    async with self.http.get(url, params=params, headers=headers) as response:
+                        self.rate_limiter.update(response.headers)
+                        if response.status == 304 and entry:
+                            cached_headers = self.cache.revalidated_headers(entry, response.headers)
+                            self.record_request(url, 200, sent, started, len(entry['body']), attempt,
+                                                response.headers)
+                            return (json.loads(entry['body']), cached_headers,
+                                    next_link_from_headers(cached_headers))
+                        if response.status not in RETRY_STATUS_CODES or attempt >= max_retries:
+                            if response.status >= 400:
+                                self.record_request(url, response.status, sent, started, 0, attempt,
+                                                    response.headers)
+                            response.raise_for_status()
+                            body = await response.read()
+                            self.record_request(url, response.status, sent, started,
+                                                response.content_length or len(body), attempt, response.headers)
+                            if cache_url and response.status == 200:
+                                self.cache.store(cache_url, response.headers, body)
+                            return json.loads(body), response.headers, next_link_from_headers(response.headers)
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= max_retries:
+                    self.record_request(url, 'error', sent, started, 0, attempt)
+                    raise
+                retry_after = None
+
+            # 429 com Retry-After já foi agendado pelo limitador
+            if retry_after is None:
+                await asyncio.sleep(backoff_delay(attempt, self.session.backoff_factor))
+            attempt += 1
+
+    def record_request(self, url, status, sent, started, size, retries, headers=None):
+        """Registra uma requisição lógica nas métricas da execução (latência da última tentativa)"""
+        now = time.perf_counter()
+        self.metrics.record_request('GET', url, status, now - sent, now - started, size, retries,
+                                    headers.get('RateLimit-Remaining') if headers is not None else None)
+
+    async def get_project_issues_page(self, project_path, state='opened', per_page=50, page=1, labels=None,
+                                      pagination='offset', next_url=None, extra_params=None):
+        """Busca uma página de issues e retorna (issues, cursor da próxima página, total de páginas)"""
+        if next_url:
+            url, params = next_url, None
+        else:
+            url, params = self.build_issues_request(project_path, state, per_page, page, labels, pagination,
+                                                    extra_params)
+
+        try:
+            issues, headers, next_link = await self.fetch_json(url, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Erro ao buscar issues via API: {e}")
+            if isinstance(e, aiohttp.ClientResponseError):
+                print(f"Status code: {e.status}")
+            self.record_failure('issues', f"página {page}" if not next_url else next_url, e)
+            return None, None, None
+
+        next_cursor = self.resolve_next_page(pagination, headers, next_link, page, per_page, len(issues))
+        return issues, next_cursor, self.read_total_pages(headers)
+
+    async def get_project_issues(self, project_path, state='opened', per_page=50, page=1, labels=None):
+        """Busca issues de um projeto usando a API pública do GitLab"""
+        issues, _, _ = await self.get_project_issues_page(project_path, state, per_page, page, labels)
+        return issues or []
+
+    async def get_issue_notes(self, project_path, issue_iid, per_page=100, sort='asc', order_by='created_at',
+                              max_notes=None, concurrency=4):
+        """Busca todas as notas de uma issue, seguindo a paginação (None se a busca falhou)
+
+        Notas do sistema (servidores que ignoram activity_filter) não contam para max_notes.
+        """
+        url, params = self.build_notes_request(project_path, issue_iid, per_page, sort, order_by)
+
+        def enough(notes):
+            return max_notes and sum(1 for note in notes if not note.get('system', False)) >= max_notes
+
+        try:
+            notes, headers, _ = await self.fetch_json(url, dict(params, page=1))
+            total_pages = self.read_total_pages(headers)
+            last_page = self.get_notes_last_page(headers, per_page, max_notes)
+
+            if last_page is None:
+                # Sem X-Total-Pages: seguir X-Next-Page sequencialmente
+                page = 1
+                while headers.get('X-Next-Page') and not enough(notes):
+                    page += 1
+                    page_notes, headers, _ = await self.fetch_json(url, dict(params, page=page))
+                    notes.extend(page_notes)
+            else:
+                if last_page > 1:
+                    results = await asyncio.gather(
+                        *(self.fetch_json(url, dict(params, page=page)) for page in range(2, last_page + 1))
+                    )
+                    for page_notes, _, _ in results:
+                        notes.extend(page_notes)
+                # Notas do sistema descartadas deixaram menos de max_notes comentários
+                page = last_page
+                while max_notes and page < total_pages and not enough(notes):
+                    page += 1
+                    notes.extend((await self.fetch_json(url, dict(params, page=page)))[0])
+
+            return notes
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self.verbose:
+                print(f"Erro ao buscar comentários da issue {issue_iid}: {e}")
+            self.record_failure('notes', f"issue #{issue_iid}", e)
+            return None
+
+    async def fetch_comments_for_issues(self, project_path, issues_data, concurrency=4, verbose=False,
+                                        notes_options=None):
+        """Busca os comentários de uma lista de issues de forma concorrente no event loop
+
+        Devolve as issues cujos comentários não puderam ser buscados (ficam sem comentários).
+        """
+        notes_options = notes_options or {}
+        max_notes = notes_options.get('max_notes')
+        pending = [issue for issue in issues_data if issue['user_notes_count'] > 0]
+        if not pending:
+            return []
+
+        if verbose:
+            print(f"  Buscando comentários de {len(pending)} issues (concorrência: {concurrency})...")
+
+        # gather preserva a ordem de entrada
+        notes_lists = await asyncio.gather(
+            *(self.get_issue_notes(self.get_issue_project_path(issue, project_path), issue['iid'],
+                                   concurrency=concurrency, **notes_options)
+              for issue in pending)
+        )
+        failed = []
+        for issue, notes in zip(pending, notes_lists):
+            if notes is None:
+                failed.append(issue)
+                notes = []
+            comments = self.build_comments_data(notes)
+            issue['comments'] = comments[:max_notes] if max_notes else comments
+
+        return failed
+
+    async def process_issues_page(self, project_path, issues, include_comments=True, include_labels=None,
+                                  exclude_labels=None, concurrency=4, verbose=False, notes_options=None):
+        """Aplica os filtros locais, normaliza e busca os comentários de uma página de issues"""
+        page_size = len(issues)
+
+        # Aplicar filtros locais por labels
+        if include_labels or exclude_labels:
+            issues = self.filter_issues_by_labels(issues, include_labels, exclude_labels)
+            if verbose and len(issues) != page_size:
+                print(f"Filtros locais reduziram para {len(issues)} issues")
+
+        page_issues = [self.build_issue_data(issue) for issue in issues]
+
+        if include_comments:
+            await self.fetch_comments_for_issues(project_path, page_issues, concurrency, verbose, notes_options)
+
+        return page_issues
+
+    async def fetch_issue_pages(self, project_path, pages, state='opened', per_page=50, labels=None, concurrency=4,
+                                extra_params=None):
+        """Busca várias páginas (modo offset) concorrentemente, devolvendo-as na ordem solicitada"""
+        results = await asyncio.gather(
+            *(self.get_project_issues_page(project_path, state=state, per_page=per_page, page=page, labels=labels,
+                                           extra_params=extra_params)
+              for page in pages)
+        )
+        return [(page, issues) for page, (issues, _, _) in zip(pages, results)]
+
+    async def extract_all_issues(self, project_path, state='opened', max_pages=5,
+                                 include_comments=True, labels=None, include_labels=None,
+                                 exclude_labels=None, verbose=False, concurrency=4,
+                                 pagination='offset', per_page=None, extra_params=None, notes_options=None):
+        """Extrai informações detalhadas de todas as issues"""
+        self.verbose = verbose
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        all_issues = []
+        page = 1
+        next_url = None
+        if per_page is None:
+            per_page = 100 if pagination == 'keyset' else 50
+
+        page_options = dict(include_comments=include_comments, include_labels=include_labels,
+                            exclude_labels=exclude_labels, concurrency=concurrency, verbose=verbose,
+                            notes_options=notes_options)
+
+        if verbose:
+            print(f"Buscando issues do projeto: {project_path} (engine assíncrona)")
+            if labels:
+                print(f"Filtro API por labels: {labels}")
+            if include_labels:
+                print(f"Filtro local incluir labels: {include_labels}")
+            if exclude_labels:
+                print(f"Filtro local excluir labels: {exclude_labels}")
+
+        connect_timeout, read_timeout = self.session.timeout
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        # Conexões keep-alive limitadas à concorrência; aiohttp descomprime gzip/deflate (e br com brotli)
+        connector = aiohttp.TCPConnector(limit=max(1, concurrency), limit_per_host=max(1, concurrency))
+        headers = {name: value for name, value in self.session.headers.items()
+                   if name not in ('Accept-Encoding', 'Connection')}
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout,
+                                         trace_configs=[self.build_trace_config()]) as http:
+            self.http = http
+            try:
+                while max_pages is None or page <= max_pages:
+                    if verbose:
+                        print(f"Processando página {page}...")
+
+                    issues, next_cursor, total_pages = await self.get_project_issues_page(
+                        project_path, state=state, per_page=per_page, page=page, labels=labels,
+                        pagination=pagination, next_url=next_url, extra_params=extra_params
+                    )
+
+                    if issues is None:
+                        print(f"[AVISO] Extração interrompida na página {page}: falha persistente na API")
+                        break
+
+                    if not issues:
+                        if verbose:
+                            print("Nenhuma issue encontrada nesta página.")
+                        break
+
+                    if verbose:
+                        print(f"Encontradas {len(issues)} issues na página {page}")
+
+                    all_issues.extend(await self.process_issues_page(project_path, issues, **page_options))
+
+                    # Sem próxima página, chegamos ao fim
+                    if not next_cursor:
+                        break
+
+                    # Total conhecido na primeira página: buscar as restantes concorrentemente
+                    if pagination == 'offset' and page == 1 and total_pages and concurrency > 1:
+                        last_page = total_pages if max_pages is None else min(total_pages, max_pages)
+                        if verbose:
+                            print(f"Total de {total_pages} páginas; buscando páginas 2-{last_page} em paralelo...")
+
+                        # Issues criadas durante a busca deslocam as páginas; descartar repetidas
+                        seen_ids = {issue.get('id') for issue in issues}
+                        pages = list(range(2, last_page + 1))
+                        for page, issues in await self.fetch_issue_pages(project_path, pages, state, per_page,
+                                                                         labels, concurrency, extra_params):
+                            if issues is None:
+                                continue  # Falha já registrada em self.failures
+                            if verbose:
+                                print(f"Encontradas {len(issues)} issues na página {page}")
+                            issues = [issue for issue in issues if issue.get('id') not in seen_ids]
+                            seen_ids.update(issue.get('id') for issue in issues)
+                            all_issues.extend(await self.process_issues_page(project_path, issues, **page_options))
+                        break
+
+                    if pagination == 'keyset':
+                        next_url = next_cursor
+                    page += 1
+            finally:
+                self.http = None
+
+        return all_issues
@@ -8,19 +8,74 @@ import requests
 import json
 import time
 import argparse
-import csv
+import asyncio
 import re
 import os
+import hashlib
+import importlib.util
+import threading
 from datetime import datetime
 from urllib.parse import quote, urljoin
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from gitlab_http import RateLimiter, GitLabSession, HTTPCache, HTTPCassette, format_connection_stats
+from gitlab_filters import LabelMatcher
+from gitlab_journal import ExtractionJournal
+from gitlab_metrics import RunMetrics, format_metrics_summary
+from gitlab_profiling import PhaseProfiler
+from gitlab_writers import (JSONSink, NDJSONSink, CSVSink, MarkdownSink, SummarySink, fan_out,
+                            COMPRESSION_SUFFIXES)
+from gitlab_models import Issue, Comment, intern_text, to_serializable
 
 class GitLabIssuesExtractor:
-    def __init__(self, base_url="https://gitlab.com", output_base_dir="reports"):
+    def __init__(self, base_url="https://gitlab.com", output_base_dir="reports", max_rate=None,
+                 max_retries=3, timeout=(5, 30), cache_dir=None, cache_max_bytes=200 * 1024 * 1024,
+                 pool_size=10, record_dir=None, replay_dir=None):
         self.base_url = base_url
         self.api_url = f"{base_url}/api/v4"
         self.output_base_dir = output_base_dir
-        self.session = requests.Session()
+        self.verbose = False
+        # Requisições que falharam mesmo após as retentativas
+        self.failures = []
+        # Issues por janela de tempo no dimensionamento automático de extract_time_windows
+        self.time_window_size = 1000
+        # 'projects' (/projects/:id/issues) ou 'groups' (/groups/:id/issues)
+        self.issues_scope = 'projects'
+        self.project_stats = []
+        self.journals = []
+        # Planos de janelas de tempo (--time-windows) gravados ao lado dos journals
+        self.window_plans = []
+        # Milestones compartilhadas entre issues: uma única cópia por id
+        self.milestones = {}
+        # 'substring' (padrão) ou 'exact' para --include-labels/--exclude-labels
+        self.label_match = 'substring'
+        self.label_matchers = {}
+        # Limite global de requisições em andamento (páginas de issues buscadas antecipadamente,
+        # pool de notas por issue e páginas de notas de cada issue compartilham as mesmas
+        # vagas, que não passam do pool de conexões)
+        self.request_slots = threading.BoundedSemaphore(max(1, pool_size))
+        # Grava cada formato de saída em sua própria thread (write_outputs)
+        self.writer_threads = False
+        # Compressão do formato ndjson: None, 'gzip' ou 'zstd'
+        self.ndjson_compression = None
+        # Todas as requisições passam pelo mesmo limitador de taxa
+        self.rate_limiter = RateLimiter(max_rate=max_rate)
+        # Cache HTTP em disco opcional, revalidado com ETag / Last-Modified
+        self.cache = HTTPCache(cache_dir, cache_max_bytes) if cache_dir else None
+        # Cassete opcional: grava as respostas da API ou as reproduz sem rede
+        if replay_dir:
+            self.cassette = HTTPCassette(replay_dir, 'replay')
+        elif record_dir:
+            self.cassette = HTTPCassette(record_dir, 'record')
+        else:
+            self.cassette = None
+        # Latência, bytes e retentativas de cada requisição e duração de cada fase
+        self.metrics = RunMetrics()
+        self.session = GitLabSession(self.rate_limiter, max_retries=max_retries, timeout=timeout,
+                                     cache=self.cache, pool_size=pool_size, cassette=self.cassette,
+                                     metrics=self.metrics)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -28,95 +83,627 @@ class GitLabIssuesExtractor:
         # Criar diretórios de saída se não existirem
         self.directories = {
             'json': Path(self.output_base_dir) / 'json',
+            'ndjson': Path(self.output_base_dir) / 'ndjson',
             'csv': Path(self.output_base_dir) / 'csv', 
             'markdown': Path(self.output_base_dir) / 'markdown',
-            'summary': Path(self.output_base_dir) / 'summary'
+            'summary': Path(self.output_base_dir) / 'summary',
+            'metrics': Path(self.output_base_dir) / 'metrics'
         }
         
         for directory in self.directories.values():
             directory.mkdir(parents=True, exist_ok=True)
 
-    def get_project_issues(self, project_path, state='opened', per_page=50, page=1, labels=None):
-        """Busca issues de um projeto usando a API pública do GitLab"""
+    def build_issues_request(self, project_path, state='opened', per_page=50, page=1, labels=None,
+                             pagination='offset', extra_params=None):
+        """Monta URL e parâmetros da listagem de issues de um projeto (ou grupo, conforme issues_scope)
+        
+        extra_params complementa ou sobrescreve os parâmetros padrão (ex.: order_by, updated_after).
+        """
         encoded_project = quote(project_path, safe='')
-        url = f"{self.api_url}/projects/{encoded_project}/issues"
+        url = f"{self.api_url}/{self.issues_scope}/{encoded_project}/issues"
         
         params = {
             'state': state,
             'per_page': per_page,
-            'page': page,
             'order_by': 'created_at',
             'sort': 'desc'
         }
         
+        # Keyset: o cursor vem no header Link, não há número de página
+        if pagination == 'keyset':
+            params['pagination'] = 'keyset'
+        else:
+            params['page'] = page
+        
         # Adicionar filtro por labels se especificado
         if labels:
             params['labels'] = ','.join(labels)
         
+        if extra_params:
+            params.update(extra_params)
+        
+        return url, params
+
+    def read_total_pages(self, headers):
+        """Lê X-Total-Pages (ausente em projetos muito grandes, onde o GitLab omite o total)"""
+        total_pages = headers.get('X-Total-Pages')
+        return int(total_pages) if total_pages else None
+
+    def resolve_next_page(self, pagination, headers, next_link, page, per_page, count):
+        """Determina o cursor da próxima página (URL no modo keyset, número no modo offset)"""
+        if pagination == 'keyset':
+            return next_link
+        
+        # X-Next-Page vem vazio na última página; sem o header, usar o tamanho da página
+        if 'X-Next-Page' in headers:
+            next_page = headers.get('X-Next-Page')
+            return int(next_page) if next_page else None
+        return page + 1 if count >= per_page else None
+
+    def get_project_issues_page(self, project_path, state='opened', per_page=50, page=1, labels=None,
+                                pagination='offset', next_url=None, extra_params=None):
+        """Busca uma página de issues e retorna (issues, cursor da próxima página, total de páginas)
+        
+        Em caso de falha (após as retentativas da sessão) issues é None, para não ser
+        confundido com o fim da listagem. A requisição ocupa uma vaga de self.request_slots.
+        """
+        if next_url:
+            url, params = next_url, None
+        else:
+            url, params = self.build_issues_request(project_path, state, per_page, page, labels, pagination,
+                                                    extra_params)
+        
         try:
-            response = self.session.get(url, params=params)
+            with self.request_slots:
+                response = self.session.get(url, params=params)
             response.raise_for_status()
-            return response.json()
+            issues = response.json()
         except requests.exceptions.RequestException as e:
             print(f"Erro ao buscar issues via API: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 print(f"Status code: {e.response.status_code}")
                 print(f"Response: {e.response.text}")
-            return []
+            self.record_failure('issues', f"página {page}" if not next_url else next_url, e)
+            return None, None, None
+        
+        next_link = response.links.get('next', {}).get('url')
+        next_cursor = self.resolve_next_page(pagination, response.headers, next_link, page, per_page, len(issues))
+        return issues, next_cursor, self.read_total_pages(response.headers)
 
-    def get_issue_notes(self, project_path, issue_iid):
-        """Busca comentários/notas de uma issue"""
+    def get_project_issues(self, project_path, state='opened', per_page=50, page=1, labels=None):
+        """Busca issues de um projeto usando a API pública do GitLab"""
+        issues, _, _ = self.get_project_issues_page(project_path, state, per_page, page, labels)
+        return issues or []
+
+    def build_notes_request(self, project_path, issue_iid, per_page=100, sort='asc', order_by='created_at'):
+        """Monta URL e parâmetros da listagem de notas de uma issue"""
         encoded_project = quote(project_path, safe='')
         url = f"{self.api_url}/projects/{encoded_project}/issues/{issue_iid}/notes"
         
-        try:
-            response = self.session.get(url)
+        # activity_filter evita transferir notas do sistema (servidores antigos o ignoram)
+        params = {
+            'per_page': per_page,
+            'sort': sort,
+            'order_by': order_by,
+            'activity_filter': 'only_comments'
+        }
+        
+        return url, params
+
+    def get_notes_last_page(self, headers, per_page=100, max_notes=None):
+        """Última página de notas a buscar, limitada por max_notes (None se o total for desconhecido)"""
+        last_page = self.read_total_pages(headers)
+        if last_page is not None and max_notes:
+            last_page = min(last_page, -(-max_notes // per_page))
+        return last_page
+
+    def get_issue_notes(self, project_path, issue_iid, per_page=100, sort='asc', order_by='created_at',
+                        max_notes=None, concurrency=4):
+        """Busca todas as notas de uma issue, seguindo a paginação
+        
+        Conhecido o total de páginas pela primeira resposta, as restantes são buscadas em
+        paralelo; max_notes limita quantas páginas são lidas. Cada requisição ocupa uma
+        vaga de self.request_slots, então o total em andamento não passa do pool de conexões.
+        Notas do sistema (servidores que ignoram activity_filter) não contam para max_notes.
+        Devolve None se a busca falhou (a falha fica em self.failures).
+        """
+        url, params = self.build_notes_request(project_path, issue_iid, per_page, sort, order_by)
+        
+        def fetch(page):
+            with self.request_slots:
+                response = self.session.get(url, params=dict(params, page=page))
             response.raise_for_status()
-            return response.json()
+            return response.json(), response.headers
+        
+        def enough(notes):
+            return max_notes and sum(1 for note in notes if not note.get('system', False)) >= max_notes
+        
+        try:
+            notes, headers = fetch(1)
+            total_pages = self.read_total_pages(headers)
+            last_page = self.get_notes_last_page(headers, per_page, max_notes)
+            
+            if last_page is None:
+                # Sem X-Total-Pages: seguir X-Next-Page sequencialmente
+                page = 1
+                while headers.get('X-Next-Page') and not enough(notes):
+                    page += 1
+                    page_notes, headers = fetch(page)
+                    notes.extend(page_notes)
+            else:
+                if last_page > 1:
+                    pages = range(2, last_page + 1)
+                    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pages)))) as executor:
+                        for page_notes, _ in executor.map(fetch, pages):
+                            notes.extend(page_notes)
+                # Notas do sistema descartadas deixaram menos de max_notes comentários
+                page = last_page
+                while max_notes and page < total_pages and not enough(notes):
+                    page += 1
+                    notes.extend(fetch(page)[0])
+            
+            return notes
         except requests.exceptions.RequestException as e:
             if self.verbose:
                 print(f"Erro ao buscar comentários da issue {issue_iid}: {e}")
-            return []
+            self.record_failure('notes', f"issue #{issue_iid}", e)
+            return None
+
+    def get_issue_project_path(self, issue, project_path):
+        """Projeto de uma issue normalizada; na listagem de grupo vem da referência completa (grupo/projeto#iid)"""
+        if self.issues_scope == 'groups':
+            full_reference = (issue.get('references') or {}).get('full') or ''
+            if '#' in full_reference:
+                return full_reference.rsplit('#', 1)[0]
+        return project_path
+
+    def split_issues_by_project(self, issues, project_path):
+        """Agrupa issues por projeto, na ordem em que cada projeto aparece"""
+        by_project = {}
+        for issue in issues:
+            by_project.setdefault(self.get_issue_project_path(issue, project_path), []).append(issue)
+        return by_project
+
+    def extract_projects(self, project_paths, extract_project, workers=2, verbose=False):
+        """Extrai vários projetos em um pool de workers e devolve {projeto: issues} na ordem de entrada
+        
+        extract_project(project_path) faz a extração de um projeto. Todos os workers usam a
+        mesma sessão, portanto o mesmo rate limiter: o orçamento de requisições é global.
+        A vazão de cada projeto fica em self.project_stats.
+        """
+        def run(project_path):
+            start = time.monotonic()
+            issues = extract_project(project_path)
+            return issues, time.monotonic() - start
+        
+        results = {}
+        stats = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(run, project_path): project_path for project_path in project_paths}
+            for future in as_completed(futures):
+                project_path = futures[future]
+                issues, seconds = future.result()
+                results[project_path] = issues
+                stats[project_path] = {'project': project_path, 'issues': len(issues), 'seconds': seconds}
+                if verbose:
+                    print(f"[OK] {project_path}: {len(issues)} issues em {seconds:.1f}s")
+        
+        self.project_stats.extend(stats[project_path] for project_path in project_paths)
+        return {project_path: results[project_path] for project_path in project_paths}
+
+    def print_project_throughput(self):
+        """Imprime issues extraídas e vazão (issues/s) por projeto"""
+        if not self.project_stats:
+            return
+        
+        print(f"\n[PROJETOS] Vazão por projeto:")
+        for stats in self.project_stats:
+            line = f"   - {stats['project']}: {stats['issues']} issues"
+            if stats.get('seconds'):
+                line += f" em {stats['seconds']:.1f}s ({stats['issues'] / stats['seconds']:.1f} issues/s)"
+            print(line)
+
+    def record_failure(self, kind, target, error):
+        """Registra uma requisição que falhou definitivamente (list.append é thread-safe)"""
+        self.failures.append({'kind': kind, 'target': target, 'error': str(error)})
+
+    def print_failure_summary(self):
+        """Imprime as requisições que falharam mesmo após as retentativas"""
+        if not self.failures:
+            return
+        
+        if self.cassette is not None and self.cassette.mode == 'replay':
+            print(f"\n[AVISO] {len(self.failures)} requisição(ões) falharam na reprodução do cassete:")
+        else:
+            print(f"\n[AVISO] {len(self.failures)} requisição(ões) falharam após {self.session.max_retries} retentativas:")
+        for failure in self.failures[:20]:
+            print(f"   - {failure['kind']} {failure['target']}: {failure['error']}")
+        if len(self.failures) > 20:
+            print(f"   ... e mais {len(self.failures) - 20}")
+
+    def connection_stats(self):
+        """Estatísticas de reuso de conexões HTTP da execução"""
+        return self.session.connection_stats()
+
+    def print_connection_summary(self):
+        """Imprime o reuso de conexões HTTP da execução"""
+        print(format_connection_stats(self.connection_stats()))
+
+    def print_cassette_summary(self):
+        """Imprime quantas respostas foram gravadas ou reproduzidas pelo cassete"""
+        if self.cassette is None:
+            return
+        stats = self.cassette.stats
+        if self.cassette.mode == 'record':
+            print(f"[CASSETE] {stats['recorded']} respostas gravadas em {self.cassette.directory}")
+        else:
+            print(f"[CASSETE] {stats['replayed']} respostas reproduzidas de {self.cassette.directory}"
+                  f" ({stats['missing']} ausentes)")
+
+    def save_metrics_report(self, custom_name=None, prometheus_path=None):
+        """Grava as métricas da execução em <output_dir>/metrics e, opcionalmente, num textfile do Prometheus"""
+        try:
+            filepath = self.get_standardized_filename('metrics', custom_name)
+            self.metrics.write_json(filepath)
+            print(f"[OK] Métricas da execução salvas em: {filepath}")
+            if prometheus_path:
+                self.metrics.write_prometheus(prometheus_path)
+                print(f"[OK] Métricas Prometheus salvas em: {prometheus_path}")
+            if self.verbose:
+                for line in format_metrics_summary(self.metrics.report()):
+                    print(line)
+            return str(filepath)
+        except Exception as e:
+            print(f"[ERRO] Erro ao salvar métricas: {e}")
+            return None
+
+    def enable_profiling(self):
+        """Perfila as fases da execução (cProfile + tracemalloc) em <output_dir>/profile/<data-hora>"""
+        directory = Path(self.output_base_dir) / 'profile' / datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        self.metrics.profiler = PhaseProfiler(directory)
+
+    def save_profile(self):
+        """Grava os perfis por fase e o relatório de memória, se o profiling estiver ativo"""
+        if self.metrics.profiler is None:
+            return None
+        directory = self.metrics.profiler.write()
+        print(f"[OK] Perfis por fase salvos em: {directory} (abra os .prof com pstats ou snakeviz)")
+        return directory
+
+    def print_cache_summary(self):
+        """Imprime as estatísticas do cache HTTP"""
+        if self.cache is None:
+            return
+        
+        stats = self.cache.stats
+        print(f"[CACHE] {stats['revalidated']} respostas revalidadas (304), {stats['stored']} armazenadas, "
+              f"{stats['evicted']} removidas ({self.cache.total_bytes / (1024 * 1024):.1f} MB em disco)")
+
+    def get_label_matcher(self, include_labels=None, exclude_labels=None):
+        """LabelMatcher dos filtros, compilado uma vez e reaproveitado em todas as páginas"""
+        key = (tuple(include_labels or ()), tuple(exclude_labels or ()), self.label_match)
+        matcher = self.label_matchers.get(key)
+        if matcher is None:
+            matcher = LabelMatcher(include_labels, exclude_labels, exact=self.label_match == 'exact')
+            self.label_matchers[key] = matcher
+        return matcher
 
     def filter_issues_by_labels(self, issues, include_labels=None, exclude_labels=None):
-        """Filtra issues por labels incluir/excluir"""
+        """Filtra issues por labels incluir/excluir (por substring ou, com label_match='exact', nome exato)"""
         if not include_labels and not exclude_labels:
             return issues
         
-        filtered_issues = []
+        matcher = self.get_label_matcher(include_labels, exclude_labels)
+        with self.metrics.phase('filter'):
+            return [issue for issue in issues if matcher.accepts(issue.get('labels') or [])]
+
+    def push_label_filters(self, labels=None, include_labels=None, exclude_labels=None, extra_params=None):
+        """Converte filtros locais exatos em parâmetros da API; devolve (labels, include, exclude, extra_params)
         
-        for issue in issues:
-            issue_labels = [label.lower() for label in issue.get('labels', [])]
-            
-            # Verificar labels a incluir
-            if include_labels:
-                include_match = any(
-                    any(inc_label.lower() in issue_label for issue_label in issue_labels)
-                    for inc_label in include_labels
-                )
-                if not include_match:
-                    continue
-            
-            # Verificar labels a excluir
-            if exclude_labels:
-                exclude_match = any(
-                    any(exc_label.lower() in issue_label for issue_label in issue_labels)
-                    for exc_label in exclude_labels
-                )
-                if exclude_match:
-                    continue
+        Só com label_match='exact': as exclusões viram `not[labels]` e uma única label de
+        inclusão entra em `labels` (a API combina labels com E; várias labels de inclusão,
+        que têm semântica OU, continuam filtradas localmente). Assim as issues excluídas
+        nem chegam a ser transferidas.
+        """
+        if self.label_match != 'exact':
+            return labels, include_labels, exclude_labels, extra_params
+        
+        extra_params = dict(extra_params or {})
+        if include_labels and len(include_labels) == 1:
+            labels = list(labels or []) + list(include_labels)
+            include_labels = None
+        if exclude_labels:
+            extra_params['not[labels]'] = ','.join(exclude_labels)
+            exclude_labels = None
+        return labels, include_labels, exclude_labels, extra_params or None
+
+    def build_issue_data(self, issue):
+        """Normaliza uma issue da API no formato de saída (Issue, serializada como dict)"""
+        milestone = issue.get('milestone')
+        if milestone:
+            milestone = self.milestones.setdefault(milestone.get('id'), milestone)
+        
+        return Issue(
+            id=issue.get('id'),
+            iid=issue.get('iid'),
+            title=issue.get('title'),
+            description=issue.get('description'),
+            state=intern_text(issue.get('state')),
+            created_at=issue.get('created_at'),
+            updated_at=issue.get('updated_at'),
+            closed_at=issue.get('closed_at'),
+            labels=[intern_text(label) for label in issue.get('labels', [])],
+            milestone=milestone,
+            assignees=[intern_text(assignee.get('name')) for assignee in issue.get('assignees', [])],
+            author=intern_text(issue.get('author', {}).get('name')),
+            author_username=intern_text(issue.get('author', {}).get('username')),
+            web_url=issue.get('web_url'),
+            references=issue.get('references'),
+            time_stats=issue.get('time_stats'),
+            confidential=issue.get('confidential'),
+            discussion_locked=issue.get('discussion_locked'),
+            due_date=issue.get('due_date'),
+            has_tasks=issue.get('has_tasks'),
+            task_status=issue.get('task_status'),
+            weight=issue.get('weight'),
+            user_notes_count=issue.get('user_notes_count', 0),
+            merge_requests_count=issue.get('merge_requests_count', 0),
+            upvotes=issue.get('upvotes', 0),
+            downvotes=issue.get('downvotes', 0),
+            comments=[]
+        )
+
+    def build_comments_data(self, notes):
+        """Normaliza as notas da API, descartando notas do sistema"""
+        comments = []
+        for comment in notes:
+            if comment.get('system', False):
+                continue  # Pular comentários do sistema
             
-            filtered_issues.append(issue)
+            comments.append(Comment(
+                id=comment.get('id'),
+                body=comment.get('body'),
+                author=intern_text(comment.get('author', {}).get('name')),
+                author_username=intern_text(comment.get('author', {}).get('username')),
+                created_at=comment.get('created_at'),
+                updated_at=comment.get('updated_at'),
+                resolvable=comment.get('resolvable'),
+                resolved=comment.get('resolved')
+            ))
+        return comments
+
+    def fetch_comments_for_issues(self, project_path, issues_data, concurrency=4, verbose=False,
+                                  notes_options=None):
+        """Busca os comentários de uma lista de issues usando um pool de threads limitado
+        
+        notes_options é repassado a get_issue_notes (per_page, sort, order_by, max_notes).
+        Devolve as issues cujos comentários não puderam ser buscados (ficam sem comentários).
+        """
+        notes_options = notes_options or {}
+        max_notes = notes_options.get('max_notes')
+        pending = [issue for issue in issues_data if issue['user_notes_count'] > 0]
+        if not pending:
+            return []
+        
+        if verbose:
+            print(f"  Buscando comentários de {len(pending)} issues (concorrência: {concurrency})...")
+        
+        def fetch(issue):
+            notes = self.get_issue_notes(self.get_issue_project_path(issue, project_path), issue['iid'],
+                                         concurrency=concurrency, **notes_options)
+            if notes is None:
+                return None
+            comments = self.build_comments_data(notes)
+            return comments[:max_notes] if max_notes else comments
+        
+        failed = []
+        # executor.map preserva a ordem de entrada
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for issue, comments in zip(pending, executor.map(fetch, pending)):
+                if comments is None:
+                    failed.append(issue)
+                    comments = []
+                issue['comments'] = comments
+        
+        return failed
+
+    def process_issues_page(self, project_path, issues, include_comments=True, include_labels=None,
+                            exclude_labels=None, concurrency=4, verbose=False, notes_options=None):
+        """Aplica os filtros locais, normaliza e busca os comentários de uma página de issues"""
+        page_size = len(issues)
+        
+        # Aplicar filtros locais por labels
+        if include_labels or exclude_labels:
+            issues = self.filter_issues_by_labels(issues, include_labels, exclude_labels)
+            if verbose and len(issues) != page_size:
+                print(f"Filtros locais reduziram para {len(issues)} issues")
+        
+        page_issues = [self.build_issue_data(issue) for issue in issues]
+        
+        # Buscar comentários da página inteira em paralelo
+        if include_comments:
+            self.fetch_comments_for_issues(project_path, page_issues, concurrency, verbose, notes_options)
         
-        return filtered_issues
+        return page_issues
+
+    def process_journaled_page(self, project_path, page, issues, journal=None, next_cursor=None, total_pages=None,
+                               include_comments=True, **page_options):
+        """process_issues_page registrando no journal a página e, em seguida, o lote de comentários"""
+        if journal is None:
+            return self.process_issues_page(project_path, issues, include_comments=include_comments, **page_options)
+        
+        page_issues = self.process_issues_page(project_path, issues, include_comments=False, **page_options)
+        journal.record_page(page, page_issues, next_cursor, total_pages)
+        if include_comments:
+            self.fetch_journaled_notes(project_path, page, page_issues, journal, page_options)
+        return page_issues
+
+    def fetch_journaled_notes(self, project_path, page, issues, journal, page_options):
+        """Busca os comentários das issues e registra no journal só os obtidos
+        
+        As issues cuja busca falhou ficam pendentes no journal, e --resume busca só elas.
+        """
+        failed = self.fetch_comments_for_issues(project_path, issues, page_options.get('concurrency', 4),
+                                                page_options.get('verbose', False), page_options.get('notes_options'))
+        failed_ids = {issue['id'] for issue in failed}
+        fetched = [issue for issue in issues if issue['id'] not in failed_ids]
+        if fetched:
+            journal.record_notes(page, fetched)
+
+    def resume_journaled_page(self, project_path, record, journal, include_comments=True, **page_options):
+        """Restaura uma página do journal, buscando os comentários que ficaram pendentes"""
+        page_issues = [Issue.from_dict(issue) for issue in record['issues']]
+        if include_comments and not record['notes_done']:
+            pending = [issue for issue in page_issues if issue['id'] in record['notes_pending']]
+            self.fetch_journaled_notes(project_path, record['page'], pending, journal, page_options)
+        if page_options.get('verbose'):
+            print(f"Página {record['page']} restaurada do journal ({len(page_issues)} issues)")
+        return page_issues
+
+    def get_journal_name(self, project_path, params):
+        """Nome (sem extensão) do journal de uma extração, projeto e hash dos parâmetros, e os parâmetros gravados"""
+        params = json.loads(json.dumps(dict(params, project=project_path, scope=self.issues_scope)))
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:10]
+        return f"{self.get_project_slug(project_path)}-{digest}", params
+
+    def open_journal(self, project_path, params, resume=False, name=None):
+        """Abre o journal da extração em <output_dir>/journal, identificado pelos parâmetros (ou por `name`)"""
+        default_name, params = self.get_journal_name(project_path, params)
+        path = Path(self.output_base_dir) / 'journal' / f"{name or default_name}.jsonl"
+        journal = ExtractionJournal(path, params, resume)
+        self.journals.append(journal)
+        return journal
+
+    def load_window_plan(self, project_path, params, resume=False):
+        """Janelas de tempo salvas por uma extração anterior com os mesmos parâmetros (ou None)
+        
+        O plano fica em <output_dir>/journal/<projeto>-<hash>-windows.json, com hash sem
+        created_after/created_before: com --resume as janelas (e os journals de cada uma,
+        <projeto>-<hash>-w<n>.jsonl) são as mesmas da execução interrompida, mesmo que
+        issues novas mudem o intervalo de created_at. Sem plano reaproveitável, os
+        journals de janelas de um plano anterior são apagados. Devolve (nome, janelas).
+        """
+        name, params = self.get_journal_name(project_path, params)
+        plan_path = Path(self.output_base_dir) / 'journal' / f"{name}-windows.json"
+        self.window_plans.append(plan_path)
+        if resume and plan_path.exists():
+            try:
+                with open(plan_path, 'r', encoding='utf-8') as f:
+                    plan = json.load(f)
+                if plan.get('params') == params:
+                    return name, [tuple(window) for window in plan['windows']]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[AVISO] Plano de janelas inválido, recomeçando: {e}")
+        for stale in plan_path.parent.glob(f"{name}-w*.jsonl"):
+            stale.unlink()
+        return name, None
+
+    def save_window_plan(self, project_path, params, windows):
+        """Grava o plano de janelas lido por load_window_plan"""
+        name, params = self.get_journal_name(project_path, params)
+        plan_path = Path(self.output_base_dir) / 'journal' / f"{name}-windows.json"
+        plan_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'windows': windows}, f, ensure_ascii=False)
+
+    def clear_journals(self):
+        """Apaga os journals da execução; mantidos se houve falhas, para que --resume busque o que faltou"""
+        if self.failures:
+            return
+        for journal in self.journals:
+            journal.remove()
+        for plan_path in self.window_plans:
+            if plan_path.exists():
+                plan_path.unlink()
+        self.journals = []
+        self.window_plans = []
+
+    def fetch_issue_pages(self, project_path, pages, state='opened', per_page=50, labels=None, concurrency=4,
+                          extra_params=None):
+        """Busca várias páginas (modo offset) em paralelo, devolvendo-as na ordem solicitada
+        
+        No máximo `concurrency` páginas ficam em andamento ou aguardando consumo, então a
+        memória retida não cresce com o total de páginas.
+        """
+        def fetch(page):
+            issues, _, _ = self.get_project_issues_page(project_path, state=state, per_page=per_page,
+                                                        page=page, labels=labels, extra_params=extra_params)
+            return issues
+        
+        window = max(1, concurrency)
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            pending = deque()
+            for page in pages:
+                pending.append((page, executor.submit(fetch, page)))
+                if len(pending) >= window:
+                    page, future = pending.popleft()
+                    yield page, future.result()
+            while pending:
+                page, future = pending.popleft()
+                yield page, future.result()
 
     def extract_all_issues(self, project_path, state='opened', max_pages=5, 
                           include_comments=True, labels=None, include_labels=None, 
-                          exclude_labels=None, delay=1.0, verbose=False):
-        """Extrai informações detalhadas de todas as issues"""
+                          exclude_labels=None, verbose=False, concurrency=4,
+                          pagination='offset', per_page=None, extra_params=None, notes_options=None,
+                          time_windows=None, journal=False, resume=False):
+        """Extrai informações detalhadas de todas as issues
+        
+        Com pagination='keyset' o cursor do header Link é seguido até o fim;
+        max_pages=None remove o limite de páginas. No modo offset, se a primeira
+        resposta trouxer X-Total-Pages, as demais páginas são buscadas em paralelo.
+        Com time_windows (número de janelas ou 'auto') o intervalo é dividido por
+        created_at e as janelas são extraídas em paralelo (ver extract_time_windows).
+        Com journal=True cada página e lote de comentários concluído é registrado em
+        <output_dir>/journal (journal também pode ser o nome do arquivo, sem extensão);
+        resume=True retoma a partir do que o journal já contém.
+        """
+        if time_windows:
+            return self.extract_time_windows(
+                project_path, time_windows, state=state, include_comments=include_comments, labels=labels,
+                include_labels=include_labels, exclude_labels=exclude_labels, verbose=verbose,
+                concurrency=concurrency, pagination=pagination, per_page=per_page, extra_params=extra_params,
+                notes_options=notes_options, journal=journal, resume=resume
+            )
+        
+        return list(self.iter_issues(
+            project_path, state=state, max_pages=max_pages, include_comments=include_comments, labels=labels,
+            include_labels=include_labels, exclude_labels=exclude_labels, verbose=verbose, concurrency=concurrency,
+            pagination=pagination, per_page=per_page, extra_params=extra_params, notes_options=notes_options,
+            journal=journal, resume=resume
+        ))
+
+    def iter_issues(self, project_path, state='opened', max_pages=5, include_comments=True, labels=None,
+                    include_labels=None, exclude_labels=None, verbose=False, concurrency=4, pagination='offset',
+                    per_page=None, extra_params=None, notes_options=None, journal=False, resume=False):
+        """Gera as issues normalizadas (com comentários) à medida que cada página é concluída
+        
+        Mesma paginação, filtros e journal de extract_all_issues, sem acumular a
+        extração em memória: só a página corrente fica retida.
+        """
         self.verbose = verbose
-        all_issues = []
         page = 1
+        next_url = None
+        if per_page is None:
+            per_page = 100 if pagination == 'keyset' else 50
+        
+        page_options = dict(include_comments=include_comments, include_labels=include_labels,
+                            exclude_labels=exclude_labels, concurrency=concurrency, verbose=verbose,
+                            notes_options=notes_options)
+        
+        restored_pages = {}
+        if journal:
+            # Verbosidade e concorrência não mudam o conteúdo das páginas: fora da identificação
+            journal_params = dict(page_options, state=state, labels=labels, pagination=pagination,
+                                  per_page=per_page, extra_params=extra_params)
+            del journal_params['verbose'], journal_params['concurrency']
+            journal = self.open_journal(project_path, journal_params, resume,
+                                        name=journal if isinstance(journal, str) else None)
+            restored_pages = journal.pages
+            if verbose and restored_pages:
+                print(f"Retomando extração: {len(restored_pages)} páginas concluídas no journal")
+        else:
+            journal = None
         
         if verbose:
             print(f"Buscando issues do projeto: {project_path}")
@@ -127,94 +714,302 @@ class GitLabIssuesExtractor:
             if exclude_labels:
                 print(f"Filtro local excluir labels: {exclude_labels}")
         
-        while page <= max_pages:
+        while max_pages is None or page <= max_pages:
             if verbose:
                 print(f"Processando página {page}...")
             
-            issues = self.get_project_issues(project_path, state=state, page=page, labels=labels)
+            if page in restored_pages:
+                record = restored_pages[page]
+                next_cursor, total_pages = record['next_cursor'], record['total_pages']
+                yield from self.resume_journaled_page(project_path, record, journal, **page_options)
+                issues = record['issues']
+            else:
+                issues, next_cursor, total_pages = self.get_project_issues_page(
+                    project_path, state=state, per_page=per_page, page=page, labels=labels,
+                    pagination=pagination, next_url=next_url, extra_params=extra_params
+                )
+                
+                if issues is None:
+                    print(f"[AVISO] Extração interrompida na página {page}: falha persistente na API")
+                    break
+                
+                if not issues:
+                    if verbose:
+                        print("Nenhuma issue encontrada nesta página.")
+                    break
+                
+                if verbose:
+                    print(f"Encontradas {len(issues)} issues na página {page}")
+                
+                yield from self.process_journaled_page(project_path, page, issues, journal, next_cursor,
+                                                       total_pages, **page_options)
             
-            if not issues:
+            # Sem próxima página, chegamos ao fim
+            if not next_cursor:
+                break
+            
+            # Total conhecido na primeira página: buscar as restantes em paralelo
+            if pagination == 'offset' and page == 1 and total_pages and concurrency > 1:
+                last_page = total_pages if max_pages is None else min(total_pages, max_pages)
                 if verbose:
-                    print("Nenhuma issue encontrada nesta página.")
+                    print(f"Total de {total_pages} páginas; buscando páginas 2-{last_page} em paralelo...")
+                
+                # Issues criadas durante a busca deslocam as páginas; descartar repetidas
+                seen_ids = {issue.get('id') for issue in issues}
+                pages = list(range(2, last_page + 1))
+                fetched_pages = self.fetch_issue_pages(project_path, [p for p in pages if p not in restored_pages],
+                                                       state, per_page, labels, concurrency, extra_params)
+                for page in pages:
+                    if page in restored_pages:
+                        page_issues = self.resume_journaled_page(project_path, restored_pages[page], journal,
+                                                                 **page_options)
+                        page_issues = [issue for issue in page_issues if issue.get('id') not in seen_ids]
+                        seen_ids.update(issue.get('id') for issue in page_issues)
+                        yield from page_issues
+                        continue
+                    
+                    _, issues = next(fetched_pages)
+                    if issues is None:
+                        continue  # Falha já registrada em self.failures
+                    if verbose:
+                        print(f"Encontradas {len(issues)} issues na página {page}")
+                    issues = [issue for issue in issues if issue.get('id') not in seen_ids]
+                    seen_ids.update(issue.get('id') for issue in issues)
+                    yield from self.process_journaled_page(project_path, page, issues, journal,
+                                                           total_pages=total_pages, **page_options)
                 break
             
-            if verbose:
-                print(f"Encontradas {len(issues)} issues na página {page}")
+            if pagination == 'keyset':
+                next_url = next_cursor
+            page += 1
+
+    def probe_created_range(self, project_path, state='opened', labels=None, extra_params=None):
+        """Consulta rápida (per_page=1) que devolve (created_at mais antigo, mais recente, total de issues)
+        
+        Com per_page=1, X-Total-Pages é o total de issues; o GitLab o omite acima de
+        10.000 resultados, caso em que o total é None.
+        """
+        probe_params = dict(extra_params or {}, order_by='created_at')
+        
+        newest, _, total = self.get_project_issues_page(project_path, state=state, per_page=1, labels=labels,
+                                                        extra_params=dict(probe_params, sort='desc'))
+        if not newest:
+            return None, None, 0 if newest == [] else None
+        oldest, _, _ = self.get_project_issues_page(project_path, state=state, per_page=1, labels=labels,
+                                                    extra_params=dict(probe_params, sort='asc'))
+        if not oldest:
+            return None, None, None
+        
+        return oldest[0]['created_at'], newest[0]['created_at'], total
+
+    def build_time_windows(self, oldest, newest, count):
+        """Divide [oldest, newest] em `count` janelas (created_after, created_before) de mesma duração
+        
+        Os limites são inclusivos na API; issues na fronteira aparecem em duas janelas
+        e são descartadas na mesclagem por id.
+        """
+        start = datetime.fromisoformat(oldest.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(newest.replace('Z', '+00:00'))
+        count = max(1, count)
+        step = (end - start) / count
+        
+        windows = []
+        for index in range(count):
+            window_start = start + step * index
+            window_end = end if index == count - 1 else start + step * (index + 1)
+            windows.append((window_start.isoformat(), window_end.isoformat()))
+        
+        # Mais recentes primeiro, como a ordem final
+        return windows[::-1]
+
+    def extract_time_windows(self, project_path, time_windows='auto', state='opened', include_comments=True,
+                             labels=None, include_labels=None, exclude_labels=None, verbose=False, concurrency=4,
+                             pagination='offset', per_page=None, extra_params=None, notes_options=None,
+                             journal=False, resume=False):
+        """Extrai o histórico completo em janelas de created_at processadas em paralelo
+        
+        Com time_windows='auto' o número de janelas vem da consulta de contagem
+        (time_window_size issues por janela, ou 4 janelas por worker quando o GitLab
+        não informa o total). Cada janela é paginada até o fim com concorrência 1, de
+        modo que `concurrency` janelas rodam ao mesmo tempo; o resultado é mesclado
+        por id em ordem created_at desc. A janela mais recente não tem limite superior,
+        então issues criadas depois da consulta de contagem também vêm. Com journal, as
+        janelas ficam num plano reaproveitado por --resume (ver load_window_plan).
+        """
+        self.verbose = verbose
+        windows = None
+        if journal:
+            plan_params = dict(time_windows=time_windows, state=state, labels=labels, include_comments=include_comments,
+                               include_labels=include_labels, exclude_labels=exclude_labels, pagination=pagination,
+                               per_page=per_page, extra_params=extra_params, notes_options=notes_options)
+            plan_name, windows = self.load_window_plan(project_path, plan_params, resume)
+            if windows and verbose:
+                print(f"Retomando extração: {len(windows)} janelas de tempo do plano anterior")
+        
+        if windows is None:
+            oldest, newest, total = self.probe_created_range(project_path, state, labels, extra_params)
+            if total == 0:
+                return []
+            if oldest is None:
+                print("[AVISO] Consulta de contagem falhou; extraindo sem janelas de tempo")
+                return self.extract_all_issues(
+                    project_path, state=state, max_pages=None, include_comments=include_comments, labels=labels,
+                    include_labels=include_labels, exclude_labels=exclude_labels, verbose=verbose,
+                    concurrency=concurrency, pagination=pagination, per_page=per_page, extra_params=extra_params,
+                    notes_options=notes_options, journal=journal, resume=resume
+                )
             
-            # Aplicar filtros locais por labels
-            if include_labels or exclude_labels:
-                original_count = len(issues)
-                issues = self.filter_issues_by_labels(issues, include_labels, exclude_labels)
-                if verbose and len(issues) != original_count:
-                    print(f"Filtros locais reduziram para {len(issues)} issues")
+            if time_windows == 'auto':
+                if total is None:
+                    count = max(1, concurrency) * 4
+                else:
+                    count = -(-total // self.time_window_size)
+            else:
+                count = int(time_windows)
+            windows = self.build_time_windows(oldest, newest, count) if oldest != newest else [(oldest, newest)]
+            windows[0] = (windows[0][0], None)
+            if journal:
+                self.save_window_plan(project_path, plan_params, windows)
             
-            for issue in issues:
-                # Dados básicos da issue
-                issue_data = {
-                    'id': issue.get('id'),
-                    'iid': issue.get('iid'),
-                    'title': issue.get('title'),
-                    'description': issue.get('description'),
-                    'state': issue.get('state'),
-                    'created_at': issue.get('created_at'),
-                    'updated_at': issue.get('updated_at'),
-                    'closed_at': issue.get('closed_at'),
-                    'labels': issue.get('labels', []),
-                    'milestone': issue.get('milestone'),
-                    'assignees': [assignee.get('name') for assignee in issue.get('assignees', [])],
-                    'author': issue.get('author', {}).get('name'),
-                    'author_username': issue.get('author', {}).get('username'),
-                    'web_url': issue.get('web_url'),
-                    'references': issue.get('references'),
-                    'time_stats': issue.get('time_stats'),
-                    'confidential': issue.get('confidential'),
-                    'discussion_locked': issue.get('discussion_locked'),
-                    'due_date': issue.get('due_date'),
-                    'has_tasks': issue.get('has_tasks'),
-                    'task_status': issue.get('task_status'),
-                    'weight': issue.get('weight'),
-                    'user_notes_count': issue.get('user_notes_count', 0),
-                    'merge_requests_count': issue.get('merge_requests_count', 0),
-                    'upvotes': issue.get('upvotes', 0),
-                    'downvotes': issue.get('downvotes', 0),
-                    'comments': []
+            if verbose:
+                print(f"Issues criadas entre {oldest} e {newest} ({total if total is not None else '10000+'} issues): "
+                      f"{len(windows)} janelas de tempo, {min(concurrency, len(windows))} em paralelo")
+        
+        def extract(numbered_window):
+            index, (created_after, created_before) = numbered_window
+            window_params = dict(extra_params or {}, created_after=created_after)
+            if created_before:
+                window_params['created_before'] = created_before
+            return self.extract_all_issues(
+                project_path, state=state, max_pages=None, include_comments=include_comments, labels=labels,
+                include_labels=include_labels, exclude_labels=exclude_labels, verbose=False, concurrency=1,
+                pagination=pagination, per_page=per_page, extra_params=window_params, notes_options=notes_options,
+                journal=f"{plan_name}-w{index}" if journal else False, resume=resume
+            )
+        
+        window_issues = []
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(windows)))) as executor:
+            for (created_after, created_before), issues in zip(windows, executor.map(extract, enumerate(windows))):
+                if verbose:
+                    print(f"Janela {created_after} - {created_before or 'agora'}: {len(issues)} issues")
+                window_issues.extend(issues)
+        
+        self.verbose = verbose
+        return self.merge_issues([], window_issues)
+
+    def get_project_slug(self, project_path):
+        """Versão de um caminho (grupo/projeto) segura para nomes de arquivo"""
+        return re.sub(r'[^A-Za-z0-9_.-]+', '-', project_path).strip('-')
+
+    def get_incremental_paths(self, project_path, state='opened', labels=None):
+        """Caminhos do checkpoint e do snapshot da sincronização incremental de um projeto/estado"""
+        key = f"{project_path}-{state}"
+        if self.issues_scope == 'groups':
+            key = f"group-{key}"
+        if labels:
+            key += '-' + ','.join(sorted(labels))
+        slug = self.get_project_slug(key)
+        directory = Path(self.output_base_dir) / 'incremental'
+        return directory / f"{slug}.checkpoint.json", directory / f"{slug}.snapshot.json"
+
+    def start_incremental_sync(self, project_path, state='opened', labels=None, include_comments=True,
+                               verbose=False):
+        """Carrega o checkpoint e devolve (estado da sincronização, parâmetros da extração)
+        
+        Sem checkpoint compatível é feita uma extração completa, sem o limite de páginas:
+        o snapshot precisa conter todo o histórico, porque issues antigas que não mudam
+        nunca voltariam numa sincronização posterior. Com checkpoint, apenas as
+        issues com updated_at >= checkpoint são buscadas (em todos os estados, para que
+        mudanças de estado também atualizem o snapshot). Os filtros locais por labels são
+        aplicados só depois da mesclagem, em finish_incremental_sync.
+        """
+        checkpoint_path, snapshot_path = self.get_incremental_paths(project_path, state, labels)
+        sync_state = {
+            'project': project_path,
+            'state': state,
+            'labels': labels,
+            'include_comments': include_comments,
+            'checkpoint_path': checkpoint_path,
+            'snapshot_path': snapshot_path,
+            'checkpoint': None,
+            'previous_issues': []
+        }
+        overrides = {'include_labels': None, 'exclude_labels': None, 'max_pages': None}
+        
+        checkpoint = None
+        if checkpoint_path.exists() and snapshot_path.exists():
+            try:
+                with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    sync_state['previous_issues'] = [Issue.from_dict(issue) for issue in json.load(f)]
+            except (OSError, ValueError) as e:
+                print(f"[AVISO] Checkpoint inválido, fazendo extração completa: {e}")
+                checkpoint = None
+                sync_state['previous_issues'] = []
+        
+        # Snapshot sem comentários não serve para uma extração com comentários
+        if checkpoint and include_comments and not checkpoint.get('include_comments'):
+            checkpoint = None
+            sync_state['previous_issues'] = []
+        
+        if checkpoint and checkpoint.get('last_updated_at'):
+            sync_state['checkpoint'] = checkpoint
+            overrides.update({
+                'state': 'all',
+                'extra_params': {
+                    'order_by': 'updated_at',
+                    'updated_after': checkpoint['last_updated_at']
                 }
-                
-                # Buscar comentários se solicitado
-                if include_comments and issue_data['user_notes_count'] > 0:
-                    if verbose:
-                        print(f"  Buscando {issue_data['user_notes_count']} comentários da issue #{issue_data['iid']}...")
-                    
-                    comments = self.get_issue_notes(project_path, issue_data['iid'])
-                    
-                    for comment in comments:
-                        if comment.get('system', False):
-                            continue  # Pular comentários do sistema
-                        
-                        comment_data = {
-                            'id': comment.get('id'),
-                            'body': comment.get('body'),
-                            'author': comment.get('author', {}).get('name'),
-                            'author_username': comment.get('author', {}).get('username'),
-                            'created_at': comment.get('created_at'),
-                            'updated_at': comment.get('updated_at'),
-                            'resolvable': comment.get('resolvable'),
-                            'resolved': comment.get('resolved')
-                        }
-                        issue_data['comments'].append(comment_data)
-                    
-                    time.sleep(0.5)  # Delay para comentários
-                
-                all_issues.append(issue_data)
+            })
+            if verbose:
+                print(f"Sincronização incremental: issues atualizadas desde {checkpoint['last_updated_at']}")
+        elif verbose:
+            print("Sincronização incremental: nenhum checkpoint encontrado, extração completa (todas as páginas)")
+        
+        return sync_state, overrides
+
+    def merge_issues(self, previous_issues, changed_issues):
+        """Mescla issues alteradas no snapshot anterior por id, mantendo a ordem created_at desc"""
+        merged = {issue['id']: issue for issue in previous_issues}
+        for issue in changed_issues:
+            merged[issue['id']] = issue
+        return sorted(merged.values(), key=lambda x: x['created_at'] or '', reverse=True)
+
+    def finish_incremental_sync(self, sync_state, changed_issues, include_labels=None, exclude_labels=None,
+                                verbose=False):
+        """Mescla as issues alteradas, grava snapshot e checkpoint e aplica os filtros de saída"""
+        merged = self.merge_issues(sync_state['previous_issues'], changed_issues)
+        
+        if verbose:
+            print(f"Sincronização incremental: {len(changed_issues)} issues alteradas, "
+                  f"{len(merged)} no snapshot")
+        
+        # Com falhas o checkpoint não avança, para que a próxima execução busque o que faltou
+        if self.failures:
+            print("[AVISO] Checkpoint incremental não atualizado devido a falhas na extração")
+        else:
+            updated_values = [issue['updated_at'] for issue in merged if issue.get('updated_at')]
+            checkpoint = {
+                'project': sync_state['project'],
+                'state': sync_state['state'],
+                'labels': sync_state['labels'],
+                'include_comments': sync_state['include_comments'],
+                'last_updated_at': max(updated_values) if updated_values else None,
+                'synced_at': datetime.now().isoformat()
+            }
             
-            # Se retornou menos issues que o limite, chegamos ao fim
-            if len(issues) < 50:
-                break
-                
-            page += 1
-            time.sleep(delay)
+            sync_state['checkpoint_path'].parent.mkdir(parents=True, exist_ok=True)
+            with open(sync_state['snapshot_path'], 'w', encoding='utf-8') as f:
+                json.dump(merged, f, ensure_ascii=False, default=to_serializable)
+            with open(sync_state['checkpoint_path'], 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+        
+        # O snapshot guarda todos os estados alterados; a saída respeita o estado pedido
+        if sync_state['state'] != 'all':
+            merged = [issue for issue in merged if issue['state'] == sync_state['state']]
         
-        return all_issues
+        return self.filter_issues_by_labels(merged, include_labels, exclude_labels)
 
     def get_standardized_filename(self, format_type, custom_name=None):
         """Gera nome padronizado do arquivo baseado na data atual"""
@@ -227,198 +1022,143 @@ class GitLabIssuesExtractor:
         
         extensions = {
             'json': '.json',
+            'ndjson': '.ndjson',
             'csv': '.csv', 
             'markdown': '.md',
-            'summary': '.md'
+            'summary': '.md',
+            'metrics': '.json'
         }
         
         filename = base_name + extensions[format_type]
+        if format_type == 'ndjson' and self.ndjson_compression:
+            filename += COMPRESSION_SUFFIXES[self.ndjson_compression]
         filepath = self.directories[format_type] / filename
         
         return filepath
 
+    def build_sinks(self, output_formats, custom_name=None):
+        """Sinks dos formatos pedidos, na ordem json, ndjson, csv, markdown, summary"""
+        factories = {
+            'json': lambda: JSONSink(self.get_standardized_filename('json', custom_name)),
+            'ndjson': lambda: NDJSONSink(self.get_standardized_filename('ndjson', custom_name)),
+            'csv': lambda: CSVSink(self.get_standardized_filename('csv', custom_name), self.csv_fieldnames,
+                                   self.build_csv_row),
+            'markdown': lambda: MarkdownSink(self.get_standardized_filename('markdown', custom_name),
+                                             self.write_markdown_issue),
+            'summary': lambda: SummarySink(self.get_standardized_filename('summary', custom_name))
+        }
+        return [factory() for output_format, factory in factories.items() if output_format in output_formats]
+
+    def write_outputs(self, issues, output_formats, custom_name=None, threaded=None):
+        """Grava todos os formatos pedidos numa única passada pelas issues (lista ou gerador)
+        
+        Com threaded=True (padrão: self.writer_threads) cada formato é gravado em sua
+        própria thread. Devolve {formato: caminho gravado ou None}.
+        
+        Com --profile e as issues em uma lista, cada formato é gravado numa passada
+        própria dentro da sua fase (save_*), com perfil e pico de memória separados;
+        num gerador (--stream) o trabalho de cada sink vira uma fase aninhada.
+        """
+        sinks = self.build_sinks(output_formats, custom_name)
+        profiler = self.metrics.profiler
+        if profiler and hasattr(issues, '__len__'):
+            results = {}
+            for sink in sinks:
+                with self.metrics.phase(sink.phase):
+                    results.update(fan_out(issues, [sink]))
+            return {sink.format: path for sink, path in results.items()}
+        
+        for sink in sinks:
+            sink.profiler = profiler
+        with self.metrics.phase('write_outputs'):
+            results = fan_out(issues, sinks, self.writer_threads if threaded is None else threaded)
+        for sink in sinks:
+            self.metrics.record_phase(sink.phase, sink.seconds)
+        return {sink.format: path for sink, path in results.items()}
+
     def save_to_json(self, issues_data, custom_name=None):
         """Salva os dados das issues em um arquivo JSON"""
-        try:
-            filepath = self.get_standardized_filename('json', custom_name)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(issues_data, f, indent=2, ensure_ascii=False)
-            print(f"[OK] Dados JSON salvos em: {filepath}")
-            return str(filepath)
-        except Exception as e:
-            print(f"[ERRO] Erro ao salvar arquivo JSON: {e}")
-            return None
+        return self.write_outputs(issues_data, ['json'], custom_name)['json']
+
+    def save_to_ndjson(self, issues_data, custom_name=None):
+        """Salva os dados das issues em JSON Lines (uma issue por linha, comprimido se ndjson_compression)"""
+        return self.write_outputs(issues_data, ['ndjson'], custom_name)['ndjson']
+
+    csv_fieldnames = [
+        'id', 'iid', 'title', 'author', 'author_username', 'state',
+        'created_at', 'updated_at', 'closed_at', 'labels', 'assignees', 
+        'web_url', 'user_notes_count', 'upvotes', 'downvotes', 
+        'merge_requests_count', 'confidential', 'due_date', 'weight',
+        'description_preview', 'milestone_title'
+    ]
+
+    def build_csv_row(self, issue):
+        """Linha do CSV de uma issue normalizada"""
+        return {
+            'id': issue['id'],
+            'iid': issue['iid'],
+            'title': issue['title'],
+            'author': issue['author'],
+            'author_username': issue['author_username'],
+            'state': issue['state'],
+            'created_at': issue['created_at'],
+            'updated_at': issue['updated_at'],
+            'closed_at': issue['closed_at'],
+            'labels': '; '.join(issue['labels']) if issue['labels'] else '',
+            'assignees': '; '.join(issue['assignees']) if issue['assignees'] else '',
+            'web_url': issue['web_url'],
+            'user_notes_count': issue['user_notes_count'],
+            'upvotes': issue['upvotes'],
+            'downvotes': issue['downvotes'],
+            'merge_requests_count': issue['merge_requests_count'],
+            'confidential': issue['confidential'],
+            'due_date': issue['due_date'],
+            'weight': issue['weight'],
+            'description_preview': (issue['description'][:200] + '...') if issue['description'] and len(issue['description']) > 200 else (issue['description'] or ''),
+            'milestone_title': issue['milestone']['title'] if issue['milestone'] else ''
+        }
 
     def save_to_csv(self, issues_data, custom_name=None):
         """Salva os dados das issues em formato CSV"""
-        try:
-            filepath = self.get_standardized_filename('csv', custom_name)
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'id', 'iid', 'title', 'author', 'author_username', 'state',
-                    'created_at', 'updated_at', 'closed_at', 'labels', 'assignees', 
-                    'web_url', 'user_notes_count', 'upvotes', 'downvotes', 
-                    'merge_requests_count', 'confidential', 'due_date', 'weight',
-                    'description_preview', 'milestone_title'
-                ]
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for issue in issues_data:
-                    row = {
-                        'id': issue['id'],
-                        'iid': issue['iid'],
-                        'title': issue['title'],
-                        'author': issue['author'],
-                        'author_username': issue['author_username'],
-                        'state': issue['state'],
-                        'created_at': issue['created_at'],
-                        'updated_at': issue['updated_at'],
-                        'closed_at': issue['closed_at'],
-                        'labels': '; '.join(issue['labels']) if issue['labels'] else '',
-                        'assignees': '; '.join(issue['assignees']) if issue['assignees'] else '',
-                        'web_url': issue['web_url'],
-                        'user_notes_count': issue['user_notes_count'],
-                        'upvotes': issue['upvotes'],
-                        'downvotes': issue['downvotes'],
-                        'merge_requests_count': issue['merge_requests_count'],
-                        'confidential': issue['confidential'],
-                        'due_date': issue['due_date'],
-                        'weight': issue['weight'],
-                        'description_preview': (issue['description'][:200] + '...') if issue['description'] and len(issue['description']) > 200 else (issue['description'] or ''),
-                        'milestone_title': issue['milestone']['title'] if issue['milestone'] else ''
-                    }
-                    writer.writerow(row)
-            
-            print(f"[OK] Dados CSV salvos em: {filepath}")
-            return str(filepath)
-        except Exception as e:
-            print(f"[ERRO] Erro ao salvar arquivo CSV: {e}")
-            return None
+        return self.write_outputs(issues_data, ['csv'], custom_name)['csv']
+
+    def write_markdown_issue(self, f, issue):
+        """Escreve a seção Markdown de uma issue"""
+        f.write(f"## Issue #{issue['iid']}: {issue['title']}\n\n")
+        f.write(f"**Estado:** {issue['state']}\n")
+        f.write(f"**Autor:** {issue['author']} (@{issue['author_username']})\n")
+        f.write(f"**Criado em:** {issue['created_at']}\n")
+        f.write(f"**Atualizado em:** {issue['updated_at']}\n")
+        f.write(f"**URL:** {issue['web_url']}\n")
+        
+        if issue['labels']:
+            f.write(f"**Labels:** {', '.join(issue['labels'])}\n")
+        
+        if issue['assignees']:
+            f.write(f"**Responsáveis:** {', '.join(issue['assignees'])}\n")
+        
+        f.write(f"\n### Descrição\n\n")
+        if issue['description']:
+            f.write(f"{issue['description']}\n\n")
+        else:
+            f.write("*Sem descrição*\n\n")
+        
+        if issue['comments']:
+            f.write(f"### Comentários ({len(issue['comments'])})\n\n")
+            for i, comment in enumerate(issue['comments'], 1):
+                f.write(f"#### Comentário {i} - {comment['author']} (@{comment['author_username']})\n")
+                f.write(f"*{comment['created_at']}*\n\n")
+                f.write(f"{comment['body']}\n\n")
+        
+        f.write("---\n\n")
 
     def save_to_markdown(self, issues_data, custom_name=None):
         """Salva os dados das issues em formato Markdown detalhado"""
-        try:
-            filepath = self.get_standardized_filename('markdown', custom_name)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Issues do GitLab - Relatório Detalhado\n\n")
-                f.write(f"**Data da extração:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"**Total de issues:** {len(issues_data)}\n\n")
-                
-                for issue in issues_data:
-                    f.write(f"## Issue #{issue['iid']}: {issue['title']}\n\n")
-                    f.write(f"**Estado:** {issue['state']}\n")
-                    f.write(f"**Autor:** {issue['author']} (@{issue['author_username']})\n")
-                    f.write(f"**Criado em:** {issue['created_at']}\n")
-                    f.write(f"**Atualizado em:** {issue['updated_at']}\n")
-                    f.write(f"**URL:** {issue['web_url']}\n")
-                    
-                    if issue['labels']:
-                        f.write(f"**Labels:** {', '.join(issue['labels'])}\n")
-                    
-                    if issue['assignees']:
-                        f.write(f"**Responsáveis:** {', '.join(issue['assignees'])}\n")
-                    
-                    f.write(f"\n### Descrição\n\n")
-                    if issue['description']:
-                        f.write(f"{issue['description']}\n\n")
-                    else:
-                        f.write("*Sem descrição*\n\n")
-                    
-                    if issue['comments']:
-                        f.write(f"### Comentários ({len(issue['comments'])})\n\n")
-                        for i, comment in enumerate(issue['comments'], 1):
-                            f.write(f"#### Comentário {i} - {comment['author']} (@{comment['author_username']})\n")
-                            f.write(f"*{comment['created_at']}*\n\n")
-                            f.write(f"{comment['body']}\n\n")
-                    
-                    f.write("---\n\n")
-            
-            print(f"[OK] Relatório Markdown salvo em: {filepath}")
-            return str(filepath)
-        except Exception as e:
-            print(f"[ERRO] Erro ao salvar arquivo Markdown: {e}")
-            return None
+        return self.write_outputs(issues_data, ['markdown'], custom_name)['markdown']
 
     def save_summary_report(self, issues_data, custom_name=None):
         """Cria um relatório resumido das issues extraídas"""
-        try:
-            filepath = self.get_standardized_filename('summary', custom_name)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write("# Relatório Resumido - Issues do GitLab\n\n")
-                f.write(f"**Data da extração:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"**Total de issues:** {len(issues_data)}\n\n")
-                
-                # Estatísticas gerais
-                f.write("## Estatísticas Gerais\n\n")
-                
-                # Por estado
-                states = {}
-                for issue in issues_data:
-                    state = issue['state']
-                    states[state] = states.get(state, 0) + 1
-                f.write("### Por Estado\n")
-                for state, count in states.items():
-                    f.write(f"- **{state.title()}:** {count} issues\n")
-                f.write("\n")
-                
-                # Por autor
-                authors = {}
-                for issue in issues_data:
-                    author = issue['author']
-                    authors[author] = authors.get(author, 0) + 1
-                
-                f.write("### Top Autores\n")
-                top_authors = sorted(authors.items(), key=lambda x: x[1], reverse=True)
-                for author, count in top_authors[:10]:
-                    f.write(f"- **{author}:** {count} issues\n")
-                f.write("\n")
-                
-                # Por labels mais comuns
-                all_labels = {}
-                for issue in issues_data:
-                    for label in issue['labels']:
-                        all_labels[label] = all_labels.get(label, 0) + 1
-                
-                if all_labels:
-                    f.write("### Labels Mais Comuns\n")
-                    top_labels = sorted(all_labels.items(), key=lambda x: x[1], reverse=True)
-                    for label, count in top_labels[:20]:
-                        f.write(f"- **{label}:** {count} issues\n")
-                    f.write("\n")
-                
-                # Lista resumida das issues
-                f.write("## 📋 Lista Resumida das Issues\n\n")
-                
-                # Ordenar por data de criação
-                issues_sorted = sorted(issues_data, key=lambda x: x['created_at'], reverse=True)
-                
-                for i, issue in enumerate(issues_sorted, 1):
-                    f.write(f"### {i}. Issue #{issue['iid']}\n\n")
-                    f.write(f"**📌 Título:** {issue['title']}\n")
-                    f.write(f"**👤 Autor:** {issue['author']} (@{issue['author_username']})\n")
-                    f.write(f"**📅 Criado:** {issue['created_at'][:10]} às {issue['created_at'][11:19]}\n")
-                    f.write(f"**🔗 URL:** {issue['web_url']}\n")
-                    f.write(f"**⚡ Estado:** {issue['state'].upper()}\n")
-                    
-                    if issue['labels']:
-                        f.write(f"**🏷️ Labels:** {', '.join(issue['labels'])}\n")
-                    
-                    # Descrição resumida
-                    if issue['description']:
-                        desc = issue['description'].replace('\n', ' ').strip()
-                        if len(desc) > 150:
-                            desc = desc[:150] + "..."
-                        f.write(f"**📝 Descrição:** {desc}\n")
-                    
-                    f.write("\n---\n\n")
-            
-            print(f"[OK] Relatório resumido salvo em: {filepath}")
-            return str(filepath)
-        except Exception as e:
-            print(f"[ERRO] Erro ao salvar relatório resumido: {e}")
-            return None
+        return self.write_outputs(issues_data, ['summary'], custom_name)['summary']
 
     def print_summary(self, issues_data):
         """Imprime um resumo das issues extraídas"""
@@ -452,6 +1192,23 @@ class GitLabIssuesExtractor:
             print(f"Top 5 labels: {top_labels}")
 
 
+def read_projects_file(path):
+    """Lê um caminho de projeto por linha, ignorando linhas vazias, comentários (#) e repetições"""
+    project_paths = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            project_path = line.split('#', 1)[0].strip()
+            if project_path and project_path not in project_paths:
+                project_paths.append(project_path)
+    return project_paths
+
+
+def save_outputs(extractor, issues, output_formats, custom_name=None):
+    """Gera os arquivos nos formatos pedidos (uma única passada pelas issues) e devolve os caminhos gerados"""
+    results = extractor.write_outputs(issues, output_formats, custom_name)
+    return [output_file for output_file in results.values() if output_file]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Extrai issues do GitLab usando a API pública',
@@ -462,6 +1219,9 @@ Exemplos de uso:
   # Extração básica com saída JSON e resumo
   python %(prog)s --output json,summary
 
+  # JSON Lines comprimido, gravado durante a extração
+  python %(prog)s --output ndjson --compress gzip --stream
+
   # Extrair apenas issues com label específica
   python %(prog)s --labels "bug,enhancement" --output csv
 
@@ -471,8 +1231,14 @@ Exemplos de uso:
   # Extração completa com todos os formatos
   python %(prog)s --state all --pages 10 --output all --include-comments
 
-  # Extração rápida sem comentários
+  # Extração rápida sem comentários, limitada a 2 requisições por segundo
   python %(prog)s --no-comments --output summary --delay 0.5
+
+  # Todos os projetos de um grupo, com saída por projeto e combinada
+  python %(prog)s --group minha-organizacao --output json,summary
+
+  # Lista de projetos extraída por 4 workers com orçamento global de 5 requisições/s
+  python %(prog)s --projects-file projetos.txt --workers 4 --delay 0.2
         """
     )
     
@@ -481,6 +1247,18 @@ Exemplos de uso:
                        default='raidiam-conformance/open-finance/certification',
                        help='Caminho do projeto no GitLab (formato: owner/repo)')
     
+    parser.add_argument('--group',
+                       help='Caminho de um grupo do GitLab: extrai as issues de todos os seus projetos '
+                            '(/groups/:id/issues)')
+    
+    parser.add_argument('--projects-file',
+                       help='Arquivo com um caminho de projeto por linha, extraídos em paralelo por --workers')
+    
+    parser.add_argument('--workers',
+                       type=int,
+                       default=2,
+                       help='Projetos extraídos em paralelo com --projects-file (default: 2)')
+    
     parser.add_argument('--state', '-s', 
                        choices=['opened', 'closed', 'all'], 
                        default='opened',
@@ -488,13 +1266,18 @@ Exemplos de uso:
     
     parser.add_argument('--pages', '-n', 
                        type=int, 
-                       default=5,
-                       help='Número máximo de páginas a processar (default: 5)')
+                       default=None,
+                       help='Número máximo de páginas a processar (default: 5 no modo offset, sem limite no modo keyset; 0 = sem limite)')
+    
+    parser.add_argument('--pagination',
+                       choices=['offset', 'keyset'],
+                       default='offset',
+                       help='Modo de paginação da API: offset (page=N) ou keyset (header Link, 100 por página) (default: offset)')
     
     parser.add_argument('--delay', '-d', 
                        type=float, 
-                       default=1.0,
-                       help='Delay em segundos entre requests (default: 1.0)')
+                       default=None,
+                       help='Intervalo mínimo em segundos entre requests (default: ritmo adaptativo pelos headers RateLimit-* do GitLab)')
     
     # Argumentos de filtros por labels
     parser.add_argument('--labels', 
@@ -506,10 +1289,21 @@ Exemplos de uso:
     parser.add_argument('--exclude-labels', 
                        help='Excluir issues com essas labels (separadas por vírgula)')
     
+    parser.add_argument('--label-match',
+                       choices=['substring', 'exact'],
+                       default='substring',
+                       help='Como --include-labels/--exclude-labels comparam labels: substring (default) ou '
+                            'exact, que envia os filtros à API (not[labels]) quando possível')
+    
     # Argumentos de saída
     parser.add_argument('--output', '-o', 
                        default='json,summary',
-                       help='Formatos de saída: json, csv, markdown, summary, all (separados por vírgula)')
+                       help='Formatos de saída: json, ndjson, csv, markdown, summary, all (separados por vírgula)')
+    
+    parser.add_argument('--compress',
+                       choices=['gzip', 'zstd'],
+                       help='Comprime o formato ndjson com gzip (.ndjson.gz) ou zstd (.ndjson.zst, requer '
+                            'pip install zstandard)')
     
     parser.add_argument('--filename', '-f',
                        help='Nome personalizado para os arquivos (será adicionado antes da data)')
@@ -527,15 +1321,139 @@ Exemplos de uso:
                        action='store_true',
                        help='Não buscar comentários das issues (mais rápido)')
     
+    parser.add_argument('--max-comments-per-issue',
+                       type=int,
+                       default=None,
+                       help='Limite de comentários buscados por issue (default: todos)')
+    
+    parser.add_argument('--comments-sort',
+                       choices=['asc', 'desc'],
+                       default='asc',
+                       help='Ordem dos comentários (default: asc)')
+    
+    parser.add_argument('--comments-order-by',
+                       choices=['created_at', 'updated_at'],
+                       default='created_at',
+                       help='Campo de ordenação dos comentários (default: created_at)')
+    
+    parser.add_argument('--concurrency', '-c',
+                       type=int,
+                       default=4,
+                       help='Número máximo de requisições de comentários em paralelo (default: 4)')
+    
+    parser.add_argument('--time-windows',
+                       help='Divide o histórico em janelas de created_at extraídas em paralelo (até --concurrency '
+                            'ao mesmo tempo): um número de janelas ou "auto" (dimensionado por uma consulta de '
+                            'contagem); ignora --pages')
+    
+    parser.add_argument('--stream',
+                       action='store_true',
+                       help='Grava as issues nos arquivos à medida que cada página é concluída, sem manter a '
+                            'extração inteira em memória')
+    
+    parser.add_argument('--writer-threads',
+                       action='store_true',
+                       help='Grava cada formato de saída em sua própria thread, sobrepondo a escrita dos arquivos')
+    
+    parser.add_argument('--resume',
+                       action='store_true',
+                       help='Retoma uma extração interrompida a partir do journal em <output-dir>/journal '
+                            '(mesmos parâmetros da execução original)')
+    
+    parser.add_argument('--incremental',
+                       action='store_true',
+                       help='Sincronização incremental: busca só issues atualizadas desde o último checkpoint em --output-dir')
+    
+    parser.add_argument('--retries',
+                       type=int,
+                       default=3,
+                       help='Retentativas para falhas transitórias da API (rede, timeout, 429, 5xx) (default: 3)')
+    
+    parser.add_argument('--timeout',
+                       default='5,30',
+                       help='Timeouts em segundos no formato CONEXAO,LEITURA ou um único valor (default: 5,30)')
+    
+    parser.add_argument('--no-cache',
+                       action='store_true',
+                       help='Desativar o cache HTTP em disco (<output-dir>/http-cache)')
+    
+    parser.add_argument('--cache-size',
+                       type=int,
+                       default=200,
+                       help='Tamanho máximo do cache HTTP em MB (default: 200)')
+    
+    parser.add_argument('--engine',
+                       choices=['sync', 'async', 'graphql'],
+                       default='sync',
+                       help='Engine de extração: sync (requests), async (aiohttp) ou graphql (issues e comentários '
+                            'na mesma consulta) (default: sync)')
+    
+    parser.add_argument('--record',
+                       metavar='DIR',
+                       help='Grava todas as respostas da API (status, headers e corpo, comprimidos) em DIR')
+    
+    parser.add_argument('--replay',
+                       metavar='DIR',
+                       help='Reproduz as respostas gravadas com --record em DIR, sem acesso à rede')
+    
+    parser.add_argument('--metrics-prometheus',
+                       metavar='ARQUIVO',
+                       help='Grava também as métricas da execução no formato textfile do Prometheus '
+                            '(node_exporter --collector.textfile); o JSON vai sempre para <output-dir>/metrics')
+    
+    parser.add_argument('--profile',
+                       action='store_true',
+                       help='Perfila cada fase (extração, filtro, cada save_*, print_summary) com cProfile e '
+                            'tracemalloc e grava os perfis em <output-dir>/profile/<data-hora>')
+    
     parser.add_argument('--verbose', '-v', 
                        action='store_true',
                        help='Modo verboso')
     
     args = parser.parse_args()
     
+    if args.group and args.projects_file:
+        parser.error('--group e --projects-file não podem ser usados juntos')
+    if args.group and args.engine == 'graphql':
+        parser.error('--group não é suportado pela engine graphql')
+    if args.time_windows and args.engine != 'sync':
+        parser.error('--time-windows requer a engine sync')
+    if args.time_windows and args.time_windows != 'auto' and not args.time_windows.isdigit():
+        parser.error('--time-windows deve ser um número de janelas ou "auto"')
+    if args.resume and args.engine != 'sync':
+        parser.error('--resume requer a engine sync')
+    if args.record and args.replay:
+        parser.error('--record e --replay não podem ser usados juntos')
+    if (args.record or args.replay) and args.engine == 'async':
+        parser.error('--record/--replay requerem a engine sync ou graphql')
+    if args.replay and not Path(args.replay).is_dir():
+        parser.error(f'diretório de --replay não encontrado: {args.replay}')
+    
+    # Projetos a extrair
+    if args.projects_file:
+        try:
+            project_paths = read_projects_file(args.projects_file)
+        except OSError as e:
+            print(f"[ERRO] Não foi possível ler {args.projects_file}: {e}")
+            return False
+        if not project_paths:
+            print(f"[ERRO] Nenhum projeto em {args.projects_file}")
+            return False
+    else:
+        project_paths = [args.group or args.project]
+    
+    # A engine assíncrona mantém uma única ClientSession por vez: projetos em sequência
+    workers = 1 if args.engine == 'async' else max(1, min(args.workers, len(project_paths)))
+    
     # Processar argumentos
     include_comments = args.include_comments and not args.no_comments
     
+    # Limite de páginas: keyset percorre todo o histórico salvo limite explícito
+    if args.pages is None:
+        max_pages = None if args.pagination == 'keyset' else 5
+    else:
+        max_pages = args.pages or None
+    
     # Processar labels
     labels = args.labels.split(',') if args.labels else None
     include_labels = args.include_labels.split(',') if args.include_labels else None
@@ -544,7 +1462,17 @@ Exemplos de uso:
     # Processar formatos de saída
     output_formats = [fmt.strip().lower() for fmt in args.output.split(',')]
     if 'all' in output_formats:
-        output_formats = ['json', 'csv', 'markdown', 'summary']
+        output_formats = ['json', 'ndjson', 'csv', 'markdown', 'summary']
+    
+    if args.compress:
+        if 'ndjson' not in output_formats:
+            parser.error('--compress se aplica ao formato ndjson (--output ndjson)')
+        if args.compress == 'zstd' and importlib.util.find_spec('zstandard') is None:
+            parser.error("--compress zstd requer o pacote 'zstandard' (pip install zstandard)")
+    
+    if args.stream:
+        if args.engine != 'sync' or args.group or args.projects_file or args.incremental or args.time_windows:
+            parser.error('--stream requer a engine sync e um único projeto, sem --incremental ou --time-windows')
     
     # Definir nome personalizado (se fornecido)
     custom_name = args.filename if args.filename else None
@@ -554,11 +1482,30 @@ Exemplos de uso:
         print("=" * 60)
         print("CONFIGURAÇÕES DA EXTRAÇÃO")
         print("=" * 60)
-        print(f"Projeto: {args.project}")
+        if args.group:
+            print(f"Grupo: {args.group}")
+        elif args.projects_file:
+            print(f"Projetos: {len(project_paths)} de {args.projects_file} ({workers} workers)")
+        else:
+            print(f"Projeto: {args.project}")
         print(f"Estado: {args.state}")
-        print(f"Páginas máximas: {args.pages}")
-        print(f"Delay: {args.delay}s")
+        print(f"Páginas máximas: {max_pages or 'sem limite'}")
+        print(f"Paginação: {args.pagination}")
+        print(f"Delay: {f'{args.delay}s' if args.delay else 'adaptativo'}")
+        print(f"Retentativas: {args.retries} (timeouts: {args.timeout}s)")
         print(f"Incluir comentários: {include_comments}")
+        print(f"Concorrência: {args.concurrency}")
+        if args.time_windows:
+            print(f"Janelas de tempo: {args.time_windows}")
+        if include_comments:
+            print(f"Comentários: {args.comments_order_by} {args.comments_sort}, "
+                  f"limite {args.max_comments_per_issue or 'nenhum'} por issue")
+        print(f"Engine: {args.engine}")
+        print(f"Incremental: {args.incremental}")
+        print(f"Retomar do journal: {args.resume}")
+        print(f"Cache HTTP: {'desativado' if args.no_cache or args.replay else f'{args.cache_size} MB'}")
+        if args.record or args.replay:
+            print(f"Cassete: {'gravando em ' + args.record if args.record else 'reproduzindo de ' + args.replay}")
         print(f"Formatos de saída: {', '.join(output_formats)}")
         print(f"Diretório de saída: {args.output_dir}")
         if custom_name:
@@ -569,56 +1516,142 @@ Exemplos de uso:
             print(f"Incluir labels: {include_labels}")
         if exclude_labels:
             print(f"Excluir labels: {exclude_labels}")
+        if include_labels or exclude_labels:
+            print(f"Comparação de labels: {args.label_match}")
         print("=" * 60)
     
     # Criar extrator com diretório de saída personalizado
-    extractor = GitLabIssuesExtractor(output_base_dir=args.output_dir)
+    timeouts = [float(value) for value in args.timeout.split(',')]
+    http_options = dict(
+        max_rate=1.0 / args.delay if args.delay else None,
+        max_retries=args.retries,
+        timeout=(timeouts[0], timeouts[-1]),
+        cache_dir=None if args.no_cache or args.replay else Path(args.output_dir) / 'http-cache',
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+        pool_size=args.concurrency * workers
+    )
+    if args.record or args.replay:
+        http_options.update(record_dir=args.record, replay_dir=args.replay)
+    if args.engine == 'async':
+        try:
+            from gitlab_async_extractor import AsyncGitLabIssuesExtractor
+            extractor = AsyncGitLabIssuesExtractor(output_base_dir=args.output_dir, **http_options)
+        except ImportError as e:
+            print(f"[ERRO] {e}")
+            return False
+    elif args.engine == 'graphql':
+        from gitlab_graphql_extractor import GraphQLGitLabIssuesExtractor
+        extractor = GraphQLGitLabIssuesExtractor(output_base_dir=args.output_dir, **http_options)
+    else:
+        extractor = GitLabIssuesExtractor(output_base_dir=args.output_dir, **http_options)
+    
+    if args.group:
+        extractor.issues_scope = 'groups'
+    extractor.label_match = args.label_match
+    extractor.writer_threads = args.writer_threads
+    extractor.ndjson_compression = args.compress
+    if args.profile:
+        extractor.enable_profiling()
+    
+    # Filtros exatos vão para a API. No modo incremental o snapshot precisa de todas as
+    # issues e o GraphQL não tem not[labels]: nesses casos o filtro continua local.
+    label_params = None
+    if args.engine != 'graphql' and not args.incremental:
+        labels, include_labels, exclude_labels, label_params = extractor.push_label_filters(
+            labels, include_labels, exclude_labels
+        )
     
     print("[INICIO] Iniciando extração de issues do GitLab...")
     
-    # Extrair issues
-    issues = extractor.extract_all_issues(
-        project_path=args.project,
+    extraction_params = dict(
         state=args.state,
-        max_pages=args.pages,
+        max_pages=max_pages,
         include_comments=include_comments,
         labels=labels,
         include_labels=include_labels,
         exclude_labels=exclude_labels,
-        delay=args.delay,
-        verbose=args.verbose
+        verbose=args.verbose,
+        concurrency=args.concurrency,
+        pagination=args.pagination,
+        notes_options={
+            'sort': args.comments_sort,
+            'order_by': args.comments_order_by,
+            'max_notes': args.max_comments_per_issue
+        }
     )
+    if label_params:
+        extraction_params['extra_params'] = label_params
+    
+    # Journal de páginas concluídas (engine sync), apagado ao final de uma extração sem falhas
+    if args.engine == 'sync':
+        extraction_params.update(time_windows=args.time_windows, journal=True, resume=args.resume)
+    
+    # Streaming: cada página vai direto para os arquivos, sem acumular a extração
+    if args.stream:
+        stream_params = dict(extraction_params, project_path=project_paths[0])
+        del stream_params['time_windows']
+        output_files = save_outputs(extractor, extractor.iter_issues(**stream_params), output_formats, custom_name)
+        
+        extractor.clear_journals()
+        extractor.print_failure_summary()
+        extractor.print_connection_summary()
+        extractor.print_cassette_summary()
+        extractor.save_metrics_report(custom_name, args.metrics_prometheus)
+        extractor.save_profile()
+        return len(output_files) == len(output_formats)
+    
+    def extract_project(project_path):
+        params = dict(extraction_params, project_path=project_path)
+        if args.incremental:
+            sync_state, overrides = extractor.start_incremental_sync(
+                project_path, args.state, labels, include_comments, args.verbose
+            )
+            params.update(overrides)
+        
+        # Extrair issues
+        with extractor.metrics.phase('extract'):
+            if args.engine == 'async':
+                issues = asyncio.run(extractor.extract_all_issues(**params))
+            else:
+                issues = extractor.extract_all_issues(**params)
+        
+        if args.incremental:
+            issues = extractor.finish_incremental_sync(sync_state, issues, include_labels, exclude_labels,
+                                                       args.verbose)
+        return issues
+    
+    if args.projects_file:
+        issues_by_project = extractor.extract_projects(project_paths, extract_project, workers, args.verbose)
+        issues = [issue for project_issues in issues_by_project.values() for issue in project_issues]
+    else:
+        issues = extract_project(project_paths[0])
+        issues_by_project = extractor.split_issues_by_project(issues, project_paths[0]) if args.group else {}
+        if args.group:
+            extractor.project_stats = [{'project': project_path, 'issues': len(project_issues)}
+                                       for project_path, project_issues in issues_by_project.items()]
     
     if not issues:
+        extractor.print_failure_summary()
+        extractor.print_cassette_summary()
+        extractor.save_metrics_report(custom_name, args.metrics_prometheus)
+        extractor.save_profile()
         print("[AVISO] Nenhuma issue foi extraída.")
         return False
     
     # Mostrar resumo
-    extractor.print_summary(issues)
+    with extractor.metrics.phase('print_summary'):
+        extractor.print_summary(issues)
     
-    # Gerar arquivos de saída
+    # Gerar arquivos de saída: um conjunto por projeto (grupo ou lista) e o combinado
     print(f"\n[ARQUIVOS] Gerando arquivos de saída...")
     generated_files = []
     
-    if 'json' in output_formats:
-        json_file = extractor.save_to_json(issues, custom_name)
-        if json_file:
-            generated_files.append(json_file)
+    for project_path, project_issues in issues_by_project.items():
+        if project_issues:
+            project_name = f"{custom_name or 'gitlab-issues'}-{extractor.get_project_slug(project_path)}"
+            generated_files.extend(save_outputs(extractor, project_issues, output_formats, project_name))
     
-    if 'csv' in output_formats:
-        csv_file = extractor.save_to_csv(issues, custom_name)
-        if csv_file:
-            generated_files.append(csv_file)
-    
-    if 'markdown' in output_formats:
-        md_file = extractor.save_to_markdown(issues, custom_name)
-        if md_file:
-            generated_files.append(md_file)
-    
-    if 'summary' in output_formats:
-        summary_file = extractor.save_summary_report(issues, custom_name)
-        if summary_file:
-            generated_files.append(summary_file)
+    generated_files.extend(save_outputs(extractor, issues, output_formats, custom_name))
     
     # Relatório final
     print(f"\n[SUCESSO] EXTRAÇÃO CONCLUÍDA COM SUCESSO!")
@@ -627,6 +1660,16 @@ Exemplos de uso:
     for file in generated_files:
         print(f"   - {file}")
     
+    extractor.clear_journals()
+    extractor.print_project_throughput()
+    extractor.print_failure_summary()
+    extractor.print_connection_summary()
+    extractor.print_cassette_summary()
+    extractor.save_metrics_report(custom_name, args.metrics_prometheus)
+    extractor.save_profile()
+    if args.verbose:
+        extractor.print_cache_summary()
+    
     return True
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Filtros por labels
+Matcher de labels pré-compilado, construído uma vez por execução
+"""
+
+import re
+
+
+class LabelMatcher:
+    """Decide se uma issue passa pelos filtros de inclusão/exclusão de labels
+
+    Em modo substring os padrões viram uma única regex (em minúsculas); em modo
+    exato, um frozenset. O resultado de cada label é memorizado, então o custo
+    por issue é proporcional ao número de labels dela, não ao de padrões.
+    """
+
+    def __init__(self, include_labels=None, exclude_labels=None, exact=False):
+        self.include = self.compile(include_labels, exact)
+        self.exclude = self.compile(exclude_labels, exact)
+        self.cache = {}
+
+    @staticmethod
+    def compile(patterns, exact=False):
+        if not patterns:
+            return None
+        lowered = [pattern.lower() for pattern in patterns]
+        if exact:
+            return frozenset(lowered)
+        return re.compile('|'.join(re.escape(pattern) for pattern in lowered))
+
+    @staticmethod
+    def matches(pattern, label):
+        if pattern is None:
+            return False
+        if isinstance(pattern, frozenset):
+            return label in pattern
+        return pattern.search(label) is not None
+
+    def classify(self, label):
+        """(casa com inclusão, casa com exclusão) de uma label, memorizado"""
+        result = self.cache.get(label)
+        if result is None:
+            lowered = label.lower()
+            result = (self.matches(self.include, lowered), self.matches(self.exclude, lowered))
+            self.cache[label] = result
+        return result
+
+    def accepts(self, labels):
+        """True se alguma label casa com a inclusão (quando houver) e nenhuma com a exclusão"""
+        included = self.include is None
+        for label in labels:
+            matches_include, matches_exclude = self.classify(label)
+            if matches_exclude:
+                return False
+            included = included or matches_include
+        return included
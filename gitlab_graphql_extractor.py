@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Backend GraphQL
+Busca cada página de issues junto com notas, labels, responsáveis e milestone em uma única consulta
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from gitlab_extractor_unified import GitLabIssuesExtractor
+from gitlab_models import Issue
+
+
+NOTE_FIELDS = """
+fragment NoteFields on Note {
+  id body system createdAt updatedAt resolvable resolved
+  author { name username }
+}
+"""
+
+ISSUES_QUERY = """
+query($fullPath: ID!, $state: IssuableState, $labels: [String], $first: Int, $after: String,
+      $sort: IssueSort, $createdAfter: Time, $createdBefore: Time, $updatedAfter: Time,
+      $withNotes: Boolean!, $notesFirst: Int) {
+  project(fullPath: $fullPath) {
+    issues(state: $state, labelName: $labels, first: $first, after: $after, sort: $sort,
+           createdAfter: $createdAfter, createdBefore: $createdBefore, updatedAfter: $updatedAfter) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id iid title description state createdAt updatedAt closedAt webUrl
+        reference fullReference: reference(full: true)
+        confidential discussionLocked dueDate weight
+        userNotesCount mergeRequestsCount upvotes downvotes
+        timeEstimate totalTimeSpent humanTimeEstimate humanTotalTimeSpent
+        taskCompletionStatus { count completedCount }
+        labels { nodes { title } }
+        assignees { nodes { name } }
+        author { name username }
+        milestone { id iid title description state dueDate startDate webPath }
+        notes(first: $notesFirst) @include(if: $withNotes) {
+          pageInfo { hasNextPage endCursor }
+          nodes { ...NoteFields }
+        }
+      }
+    }
+  }
+}
+""" + NOTE_FIELDS
+
+NOTES_QUERY = """
+query($fullPath: ID!, $iid: String!, $first: Int, $after: String) {
+  project(fullPath: $fullPath) {
+    issue(iid: $iid) {
+      notes(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { ...NoteFields }
+      }
+    }
+  }
+}
+""" + NOTE_FIELDS
+
+# Parâmetros REST (extra_params) com equivalente na consulta GraphQL
+GRAPHQL_FILTERS = {
+    'created_after': 'createdAfter',
+    'created_before': 'createdBefore',
+    'updated_after': 'updatedAfter'
+}
+
+
+def global_id_to_int(global_id):
+    """Converte um ID global ("gid://gitlab/Issue/123") no ID numérico da API REST"""
+    if not global_id:
+        return None
+    return int(str(global_id).rsplit('/', 1)[-1])
+
+
+class GraphQLGitLabIssuesExtractor(GitLabIssuesExtractor):
+    """Extrator que usa a API GraphQL do GitLab, produzindo os mesmos dicts da versão REST
+
+    As consultas são enviadas por GET, passando pela mesma sessão (rate limit,
+    retentativas e cache) usada pelo extrator REST.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.graphql_url = f"{self.base_url}/api/graphql"
+
+    def run_query(self, query, variables, target):
+        """Executa uma consulta GraphQL; retorna `data` ou None (falha registrada)"""
+        try:
+            response = self.session.get(self.graphql_url, params={
+                'query': query,
+                'variables': json.dumps(variables)
+            })
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Erro na consulta GraphQL ({target}): {e}")
+            self.record_failure('graphql', target, e)
+            return None
+
+        if payload.get('errors'):
+            message = '; '.join(error.get('message', '') for error in payload['errors'])
+            print(f"Erro na consulta GraphQL ({target}): {message}")
+            self.record_failure('graphql', target, message)
+            return None
+
+        return payload.get('data')
+
+    def build_issue_data_from_graphql(self, node):
+        """Normaliza uma issue GraphQL no mesmo formato (Issue) de build_issue_data"""
+        milestone = node.get('milestone')
+        if milestone:
+            milestone = {
+                'id': global_id_to_int(milestone.get('id')),
+                'iid': int(milestone['iid']) if milestone.get('iid') else None,
+                'title': milestone.get('title'),
+                'description': milestone.get('description'),
+                'state': milestone.get('state'),
+                'due_date': milestone.get('dueDate'),
+                'start_date': milestone.get('startDate'),
+                'web_url': f"{self.base_url}{milestone['webPath']}" if milestone.get('webPath') else None
+            }
+
+        tasks = node.get('taskCompletionStatus') or {}
+        task_count = tasks.get('count') or 0
+
+        return Issue.from_dict({
+            'id': global_id_to_int(node.get('id')),
+            'iid': int(node['iid']) if node.get('iid') else None,
+            'title': node.get('title'),
+            'description': node.get('description'),
+            'state': node.get('state'),
+            'created_at': node.get('createdAt'),
+            'updated_at': node.get('updatedAt'),
+            'closed_at': node.get('closedAt'),
+            'labels': [label.get('title') for label in (node.get('labels') or {}).get('nodes', [])],
+            'milestone': milestone,
+            'assignees': [assignee.get('name') for assignee in (node.get('assignees') or {}).get('nodes', [])],
+            'author': (node.get('author') or {}).get('name'),
+            'author_username': (node.get('author') or {}).get('username'),
+            'web_url': node.get('webUrl'),
+            'references': {
+                'short': node.get('reference'),
+                'relative': node.get('reference'),
+                'full': node.get('fullReference')
+            },
+            'time_stats': {
+                'time_estimate': node.get('timeEstimate'),
+                'total_time_spent': node.get('totalTimeSpent'),
+                'human_time_estimate': node.get('humanTimeEstimate'),
+                'human_total_time_spent': node.get('humanTotalTimeSpent')
+            },
+            'confidential': node.get('confidential'),
+            'discussion_locked': node.get('discussionLocked'),
+            'due_date': node.get('dueDate'),
+            'has_tasks': task_count > 0,
+            'task_status': f"{tasks.get('completedCount') or 0} of {task_count} checklist items completed",
+            'weight': node.get('weight'),
+            'user_notes_count': node.get('userNotesCount', 0),
+            'merge_requests_count': node.get('mergeRequestsCount', 0),
+            'upvotes': node.get('upvotes', 0),
+            'downvotes': node.get('downvotes', 0),
+            'comments': []
+        })
+
+    def build_comments_data_from_graphql(self, nodes):
+        """Converte notas GraphQL para o formato REST e reaproveita build_comments_data"""
+        notes = [{
+            'id': global_id_to_int(note.get('id')),
+            'body': note.get('body'),
+            'author': note.get('author') or {},
+            'created_at': note.get('createdAt'),
+            'updated_at': note.get('updatedAt'),
+            'resolvable': note.get('resolvable'),
+            'resolved': note.get('resolved'),
+            'system': note.get('system', False)
+        } for note in nodes]
+        return self.build_comments_data(notes)
+
+    def fetch_remaining_notes(self, project_path, iid, cursor, per_page=100, max_notes=None, fetched=0):
+        """Segue o cursor das notas de uma issue além da primeira página da consulta principal
+
+        `fetched` é quantos comentários já vieram; notas do sistema, descartadas na
+        normalização, não contam para max_notes.
+        """
+        nodes = []
+        while cursor and not (max_notes and fetched >= max_notes):
+            data = self.run_query(NOTES_QUERY, {
+                'fullPath': project_path, 'iid': str(iid), 'first': per_page, 'after': cursor
+            }, f"notas da issue #{iid}")
+            if data is None:
+                break
+
+            notes = (((data.get('project') or {}).get('issue') or {}).get('notes') or {})
+            page_nodes = notes.get('nodes', [])
+            nodes.extend(page_nodes)
+            fetched += sum(1 for node in page_nodes if not node.get('system', False))
+            page_info = notes.get('pageInfo') or {}
+            cursor = page_info.get('endCursor') if page_info.get('hasNextPage') else None
+        return nodes
+
+    def extract_all_issues(self, project_path, state='opened', max_pages=5,
+                           include_comments=True, labels=None, include_labels=None,
+                           exclude_labels=None, verbose=False, concurrency=4,
+                           pagination='offset', per_page=None, extra_params=None, notes_options=None,
+                           notes_per_issue=20):
+        """Extrai issues via GraphQL com cursor nas issues e nas notas
+
+        `pagination` é ignorado (GraphQL usa sempre cursor); `per_page` issues (50 por
+        padrão, como na API REST) e `notes_per_issue` notas vêm em cada consulta,
+        mantendo a complexidade baixa.
+        """
+        self.verbose = verbose
+        notes_options = notes_options or {}
+        max_notes = notes_options.get('max_notes')
+        # As notas só vêm em ordem de criação crescente: com sort=desc ou order_by=updated_at
+        # os max_notes pedidos não são os primeiros, então é preciso buscar todas antes de
+        # ordenar e truncar
+        notes_limit = None if (notes_options.get('sort') == 'desc'
+                               or notes_options.get('order_by') == 'updated_at') else max_notes
+        extra_params = dict(extra_params or {})
+        all_issues = []
+        page = 1
+        cursor = None
+
+        variables = {
+            'fullPath': project_path,
+            'state': state,
+            'labels': labels,
+            'first': min(per_page or 50, 100),
+            'sort': 'UPDATED_DESC' if extra_params.pop('order_by', None) == 'updated_at' else 'CREATED_DESC',
+            'withNotes': include_comments,
+            'notesFirst': min(notes_per_issue, notes_limit) if notes_limit else notes_per_issue
+        }
+        for rest_name, graphql_name in GRAPHQL_FILTERS.items():
+            variables[graphql_name] = extra_params.pop(rest_name, None)
+        if extra_params and verbose:
+            print(f"[AVISO] Parâmetros sem equivalente no GraphQL ignorados: {', '.join(extra_params)}")
+
+        if verbose:
+            print(f"Buscando issues do projeto: {project_path} (GraphQL)")
+
+        while max_pages is None or page <= max_pages:
+            if verbose:
+                print(f"Processando página {page}...")
+
+            data = self.run_query(ISSUES_QUERY, dict(variables, after=cursor), f"página {page}")
+            if data is None:
+                print(f"[AVISO] Extração interrompida na página {page}: falha persistente na API")
+                break
+
+            connection = ((data.get('project') or {}).get('issues') or {})
+            nodes = connection.get('nodes', [])
+            if not nodes:
+                if verbose:
+                    print("Nenhuma issue encontrada nesta página.")
+                break
+
+            if verbose:
+                print(f"Encontradas {len(nodes)} issues na página {page}")
+
+            page_issues = []
+            pending_notes = []
+            for node in nodes:
+                issue_data = self.build_issue_data_from_graphql(node)
+                if include_comments and node.get('notes'):
+                    note_nodes = node['notes'].get('nodes', [])
+                    page_info = node['notes'].get('pageInfo') or {}
+                    if page_info.get('hasNextPage'):
+                        pending_notes.append((issue_data, note_nodes, page_info.get('endCursor')))
+                    else:
+                        issue_data['comments'] = self.build_comments_data_from_graphql(note_nodes)
+                page_issues.append(issue_data)
+
+            # Filtros locais sobre os dados já normalizados (mesmo campo 'labels'), antes de
+            # buscar o restante das notas: issues descartadas não geram requisições
+            if include_labels or exclude_labels:
+                page_issues = self.filter_issues_by_labels(page_issues, include_labels, exclude_labels)
+                kept_ids = {issue_data['id'] for issue_data in page_issues}
+                pending_notes = [item for item in pending_notes if item[0]['id'] in kept_ids]
+
+            # Issues com muitas notas: seguir o cursor delas em paralelo
+            if pending_notes:
+                def fetch(item):
+                    issue_data, note_nodes, notes_cursor = item
+                    return note_nodes + self.fetch_remaining_notes(
+                        project_path, issue_data['iid'], notes_cursor, max_notes=notes_limit,
+                        fetched=sum(1 for node in note_nodes if not node.get('system', False))
+                    )
+
+                with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                    for (issue_data, _, _), note_nodes in zip(pending_notes, executor.map(fetch, pending_notes)):
+                        issue_data['comments'] = self.build_comments_data_from_graphql(note_nodes)
+
+            for issue_data in page_issues:
+                comments = issue_data['comments']
+                if notes_options.get('order_by') == 'updated_at':
+                    comments.sort(key=lambda x: x['updated_at'] or '')
+                if notes_options.get('sort') == 'desc':
+                    comments.reverse()
+                if max_notes:
+                    issue_data['comments'] = comments[:max_notes]
+
+            all_issues.extend(page_issues)
+
+            page_info = connection.get('pageInfo') or {}
+            if not page_info.get('hasNextPage'):
+                break
+
+            cursor = page_info.get('endCursor')
+            page += 1
+
+        return all_issues
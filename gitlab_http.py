@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Camada HTTP compartilhada
+Controle de taxa adaptativo, timeouts e retentativas das requisições à API do GitLab
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+class RateLimiter:
+    """Token bucket thread-safe que se ajusta aos headers RateLimit-* e Retry-After do GitLab
+
+    Sem `max_rate` e antes de receber headers do servidor não há limite (GitLab
+    self-managed muitas vezes não envia RateLimit-*); com os headers o ritmo passa a
+    ser o orçamento restante dividido pelo tempo até o reset. `max_rate` impõe um teto
+    fixo desde a primeira requisição, com burst 1: o intervalo mínimo entre
+    requisições vale também para as primeiras.
+    """
+
+    def __init__(self, initial_rate=None, burst=10, max_rate=None):
+        self.max_rate = max_rate
+        if max_rate:
+            self.rate = min(initial_rate, max_rate) if initial_rate else max_rate
+            burst = 1
+        else:
+            self.rate = initial_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def refill(self, now):
+        """Repõe tokens proporcionalmente ao tempo decorrido (chamar com o lock)"""
+        elapsed = now - self.updated_at
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(self):
+        """Reserva um token e retorna quantos segundos esperar antes de enviar a requisição"""
+        with self.lock:
+            now = time.monotonic()
+            if self.rate is None:
+                return max(0.0, self.blocked_until - now)
+            self.refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self):
+        """Bloqueia até que a requisição possa ser enviada"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, headers):
+        """Ajusta o ritmo a partir dos headers de uma resposta"""
+        now = time.monotonic()
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        remaining = headers.get('RateLimit-Remaining')
+        reset = headers.get('RateLimit-Reset')
+
+        with self.lock:
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+            if remaining is None or reset is None:
+                return
+
+            try:
+                remaining = int(remaining)
+                seconds_to_reset = max(float(reset) - time.time(), 1.0)
+            except ValueError:
+                return
+
+            if remaining <= 0:
+                self.blocked_until = max(self.blocked_until, now + seconds_to_reset)
+                return
+
+            self.refill(now)
+            rate = remaining / seconds_to_reset
+            self.rate = min(rate, self.max_rate) if self.max_rate else rate
+            self.tokens = min(self.tokens, float(remaining))
+
+
+def parse_retry_after(value):
+    """Converte Retry-After (segundos ou data HTTP) em segundos"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def next_link_from_headers(headers):
+    """Extrai a URL rel="next" de um header Link"""
+    for link in parse_header_links(headers.get('Link', '')):
+        if link.get('rel') == 'next':
+            return link.get('url')
+    return None
+
+
+class HTTPCache:
+    """Cache persistente de respostas GET revalidadas com ETag / Last-Modified
+
+    Cada entrada é um arquivo `<sha256 da URL>.cache` (linha de metadados JSON seguida
+    do corpo). Só são guardadas respostas com validador; o tamanho total é limitado a
+    `max_bytes` com remoção LRU (ordem de último uso, persistida pelo mtime dos arquivos).
+    """
+
+    # Headers que descrevem a transferência, não o conteúdo guardado
+    TRANSPORT_HEADERS = ('Content-Length', 'Content-Encoding', 'Transfer-Encoding', 'Connection')
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = OrderedDict()
+        self.total_bytes = 0
+        self.stats = {'revalidated': 0, 'stored': 0, 'evicted': 0}
+
+        entries = sorted(self.directory.glob('*.cache'), key=lambda path: path.stat().st_mtime)
+        for path in entries:
+            size = path.stat().st_size
+            self.index[path.stem] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def request_url(url, params=None):
+        """URL completa (com parâmetros) usada como chave do cache"""
+        prepared = requests.models.PreparedRequest()
+        prepared.prepare_url(url, params)
+        return prepared.url
+
+    def entry_path(self, key):
+        return self.directory / f"{key}.cache"
+
+    def lookup(self, url):
+        """Retorna a entrada {'url', 'headers', 'body'} guardada para a URL, ou None"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        with self.lock:
+            if key not in self.index:
+                return None
+            self.index.move_to_end(key)
+
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline().decode('utf-8'))
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return {'url': meta['url'], 'headers': meta['headers'], 'body': body}
+
+    def conditional_headers(self, entry):
+        """Headers If-None-Match / If-Modified-Since para revalidar uma entrada"""
+        headers = {}
+        stored = CaseInsensitiveDict(entry['headers'])
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def revalidated_headers(self, entry, headers):
+        """Headers da entrada atualizados com os da resposta 304 (rate limit, data...)"""
+        merged = CaseInsensitiveDict(entry['headers'])
+        for name, value in headers.items():
+            if name not in self.TRANSPORT_HEADERS:
+                merged[name] = value
+        with self.lock:
+            self.stats['revalidated'] += 1
+        return merged
+
+    def store(self, url, headers, body):
+        """Guarda a resposta se ela tiver ETag ou Last-Modified"""
+        headers = CaseInsensitiveDict(headers)
+        if not headers.get('ETag') and not headers.get('Last-Modified'):
+            return
+
+        stored_headers = {name: value for name, value in headers.items()
+                          if name not in self.TRANSPORT_HEADERS}
+        meta = json.dumps({'url': url, 'headers': stored_headers}).encode('utf-8')
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        path = self.entry_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(meta + b'\n')
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        size = len(meta) + 1 + len(body)
+        with self.lock:
+            self.total_bytes += size - self.index.pop(key, 0)
+            self.index[key] = size
+            self.stats['stored'] += 1
+            self.evict()
+
+    def evict(self):
+        """Remove as entradas menos usadas até caber em max_bytes (chamar com o lock)"""
+        while self.total_bytes > self.max_bytes and self.index:
+            key, size = self.index.popitem(last=False)
+            self.total_bytes -= size
+            self.stats['evicted'] += 1
+            try:
+                self.entry_path(key).unlink()
+            except OSError:
+                pass
+
+    def build_response(self, entry, revalidation):
+        """Monta um requests.Response 200 a partir da entrada revalidada por um 304"""
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = entry['body']
+        response.headers = self.revalidated_headers(entry, revalidation.headers)
+        response.url = revalidation.url
+        response.request = revalidation.request
+        response.encoding = revalidation.encoding or 'utf-8'
+        response.reason = 'OK'
+        response.elapsed = revalidation.elapsed
+        return response
+
+
+class HTTPCassette:
+    """Gravação e reprodução de respostas da API para execuções offline e determinísticas
+
+    No modo 'record' cada resposta (status, headers e corpo) é gravada em
+    `<sha256 de método + URL>-<n>.json.gz`, onde n conta as repetições da mesma URL.
+    No modo 'replay' as respostas são servidas na mesma ordem sem acesso à rede;
+    repetições além das gravadas recebem a última gravação e URLs ausentes geram
+    ConnectionError, tratado pelos extratores como falha da requisição.
+    """
+
+    def __init__(self, directory, mode='replay'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Modo de cassete inválido: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.stats = {'recorded': 0, 'replayed': 0, 'missing': 0}
+
+        if mode == 'record':
+            self.directory.mkdir(parents=True, exist_ok=True)
+        elif not self.directory.is_dir():
+            raise FileNotFoundError(f"Diretório de cassete não encontrado: {self.directory}")
+
+    def next_index(self, key):
+        with self.lock:
+            index = self.counters.get(key, 0)
+            self.counters[key] = index + 1
+        return index
+
+    def entry_path(self, key, index):
+        return self.directory / f"{key}-{index}.json.gz"
+
+    @staticmethod
+    def entry_key(method, url):
+        return hashlib.sha256(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+
+    def record(self, method, url, response):
+        """Grava a resposta final (após retentativas e cache) de uma requisição"""
+        key = self.entry_key(method, url)
+        path = self.entry_path(key, self.next_index(key))
+        entry = {
+            'method': method.upper(),
+            'url': url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: value for name, value in response.headers.items()
+                        if name not in HTTPCache.TRANSPORT_HEADERS},
+            'body': base64.b64encode(response.content).decode('ascii')
+        }
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.stats['recorded'] += 1
+
+    def replay(self, method, url):
+        """Devolve a resposta gravada para a requisição como um requests.Response"""
+        key = self.entry_key(method, url)
+        index = self.next_index(key)
+        while index > 0 and not self.entry_path(key, index).exists():
+            index -= 1
+        path = self.entry_path(key, index)
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self.lock:
+                self.stats['missing'] += 1
+            raise requests.exceptions.ConnectionError(f"Resposta não gravada no cassete: {method.upper()} {url}")
+
+        response = requests.models.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response._content = base64.b64decode(entry['body'])
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = url
+        response.request = requests.Request(method, url).prepare()
+        response.encoding = 'utf-8'
+        with self.lock:
+            self.stats['replayed'] += 1
+        return response
+
+
+def format_connection_stats(stats):
+    """Resumo de uma linha do reuso de conexões"""
+    requests_sent = stats['requests']
+    reused = max(requests_sent - stats['connections'], 0)
+    ratio = (reused / requests_sent * 100) if requests_sent else 0.0
+    return (f"[HTTP] {requests_sent} requisições em {stats['connections']} conexões "
+            f"({reused} reaproveitadas, {ratio:.0f}% de reuso)")
+
+
+# Status transitórios que justificam repetir uma requisição idempotente
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+def backoff_delay(attempt, backoff_factor=0.5, max_backoff=30.0):
+    """Espera para a tentativa `attempt` (0, 1, ...): backoff exponencial com full jitter"""
+    return random.uniform(0, min(max_backoff, backoff_factor * (2 ** attempt)))
+
+
+class GitLabSession(requests.Session):
+    """requests.Session usada pelos extratores
+
+    Todas as requisições passam pelo RateLimiter e recebem timeout explícito
+    (conexão, leitura). Requisições idempotentes que falham com erro de rede,
+    timeout ou status transitório (429/5xx) são repetidas até `max_retries`
+    vezes com backoff exponencial e jitter; 429 respeita o Retry-After.
+    Com um HTTPCache, GETs são revalidados com requisições condicionais e
+    respostas 304 são servidas a partir do cache. Com um HTTPCassette as respostas
+    são gravadas ('record') ou servidas do disco sem rede ('replay'). Com um
+    RunMetrics (gitlab_metrics) cada requisição é registrada com endpoint, status,
+    latência, bytes, retentativas e RateLimit-Remaining.
+
+    O pool de conexões keep-alive por host comporta `pool_size` conexões (use o
+    nível de concorrência) e as respostas são pedidas comprimidas com todas as
+    codificações que o urllib3 instalado sabe decodificar (gzip, deflate, br, zstd).
+    """
+
+    def __init__(self, rate_limiter=None, max_retries=3, backoff_factor=0.5, timeout=(5, 30), cache=None,
+                 pool_size=10, cassette=None, metrics=None):
+        super().__init__()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cache = cache
+        self.cassette = cassette
+        self.metrics = metrics
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_size))
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.headers.update({
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive'
+        })
+
+    def connection_stats(self):
+        """Requisições enviadas e conexões abertas pelos pools do urllib3"""
+        stats = {'requests': 0, 'connections': 0}
+        for adapter in set(self.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+        return stats
+
+    def request(self, method, url, *args, **kwargs):
+        if self.metrics is None:
+            return self.cassette_request(method, url, *args, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            response = self.cassette_request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            # Na reprodução do cassete não há retentativas: a resposta ausente falha de imediato
+            replaying = self.cassette is not None and self.cassette.mode == 'replay'
+            retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS and not replaying else 0
+            self.metrics.record_request(method, url, 'error', 0.0, time.perf_counter() - started, retries=retries)
+            raise
+
+        content_length = response.headers.get('Content-Length')
+        size = int(content_length) if content_length and content_length.isdigit() else len(response.content)
+        self.metrics.record_request(method, url, response.status_code, response.elapsed.total_seconds(),
+                                    time.perf_counter() - started, size, getattr(response, 'retries', 0),
+                                    response.headers.get('RateLimit-Remaining'))
+        return response
+
+    def cassette_request(self, method, url, *args, **kwargs):
+        """Requisição gravada ou reproduzida pelo HTTPCassette, quando houver cassete"""
+        if self.cassette is None:
+            return self.cached_request(method, url, *args, **kwargs)
+
+        request_url = HTTPCache.request_url(url, kwargs.get('params'))
+        if self.cassette.mode == 'replay':
+            return self.cassette.replay(method, request_url)
+
+        response = self.cached_request(method, url, *args, **kwargs)
+        self.cassette.record(method, request_url, response)
+        return response
+
+    def cached_request(self, method, url, *args, **kwargs):
+        """Requisição com revalidação pelo HTTPCache (só GET), quando houver cache"""
+        if self.cache is None or method.upper() != 'GET':
+            return self.send_with_retries(method, url, *args, **kwargs)
+
+        cache_url = self.cache.request_url(url, kwargs.get('params'))
+        entry = self.cache.lookup(cache_url)
+        if entry:
+            headers = dict(kwargs.get('headers') or {})
+            headers.update(self.cache.conditional_headers(entry))
+            kwargs['headers'] = headers
+
+        response = self.send_with_retries(method, url, *args, **kwargs)
+
+        if response.status_code == 304 and entry:
+            return self.cache.build_response(entry, response)
+        if response.status_code == 200:
+            self.cache.store(cache_url, response.headers, response.content)
+        return response
+
+    def send_with_retries(self, method, url, *args, **kwargs):
+        """Envia a requisição respeitando o RateLimiter, com timeout e retentativas"""
+        kwargs.setdefault('timeout', self.timeout)
+        retryable = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_factor))
+                attempt += 1
+                continue
+
+            self.rate_limiter.update(response.headers)
+
+            if (not retryable or response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries):
+                response.retries = attempt
+                return response
+
+            response.close()
+
+            # 429 com Retry-After já foi agendado pelo limitador
+            if response.status_code != 429 or response.headers.get('Retry-After') is None:
+                time.sleep(backoff_delay(attempt, self.backoff_factor))
+            attempt += 1
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Journal de extração
+Registro append-only das páginas e lotes de comentários concluídos, usado para retomar extrações interrompidas
+"""
+
+import json
+import os
+import threading
+
+from gitlab_models import to_serializable
+
+
+class ExtractionJournal:
+    """Journal JSON Lines de uma extração
+
+    A primeira linha guarda os parâmetros da extração; as seguintes registram cada
+    página normalizada ('page') e, depois, os comentários dessa página ('notes'),
+    indexados pelo `id` global da issue (o iid se repete entre projetos de um grupo).
+    Uma página pode ter vários registros 'notes': só as issues cujos comentários
+    foram obtidos são registradas, e as demais ficam pendentes para --resume.
+    Cada linha é gravada com flush + fsync, então uma interrupção perde no máximo a
+    linha em andamento, que é ignorada na leitura.
+    """
+
+    def __init__(self, path, params, resume=False):
+        self.path = path
+        self.params = params
+        self.pages = {}
+        self.lock = threading.Lock()
+
+        if resume:
+            self.pages = self.load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.pages:
+            # Extração nova (ou journal incompatível): recomeçar o arquivo
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'type': 'header', 'params': params}, ensure_ascii=False) + '\n')
+
+    def load(self):
+        """Lê o journal e devolve {página: registro} das páginas concluídas
+
+        Em cada registro, `notes_pending` tem os ids das issues com comentários ainda
+        não obtidos e `notes_done` indica que não falta nenhum.
+        """
+        if not self.path.exists():
+            return {}
+
+        pages = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Linha truncada pela interrupção
+
+                if number == 0:
+                    if record.get('type') != 'header' or record.get('params') != self.params:
+                        print(f"[AVISO] Journal {self.path} é de outra extração; recomeçando do zero")
+                        return {}
+                    continue
+
+                if record['type'] == 'page':
+                    pages[record['page']] = dict(record, notes_fetched=set())
+                elif record['type'] == 'notes' and record['page'] in pages:
+                    comments = record['comments']
+                    for issue in pages[record['page']]['issues']:
+                        if str(issue['id']) in comments:
+                            issue['comments'] = comments[str(issue['id'])]
+                            pages[record['page']]['notes_fetched'].add(issue['id'])
+
+        for page in pages.values():
+            fetched = page.pop('notes_fetched')
+            page['notes_pending'] = {issue['id'] for issue in page['issues']
+                                     if issue.get('user_notes_count') and issue['id'] not in fetched}
+            page['notes_done'] = not page['notes_pending']
+        return pages
+
+    def append(self, record):
+        """Acrescenta um registro e força a gravação em disco"""
+        line = json.dumps(record, ensure_ascii=False, default=to_serializable) + '\n'
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_page(self, page, issues, next_cursor=None, total_pages=None):
+        """Registra uma página de issues já filtrada e normalizada"""
+        self.append({'type': 'page', 'page': page, 'next_cursor': next_cursor, 'total_pages': total_pages,
+                     'issues': issues})
+
+    def record_notes(self, page, issues):
+        """Registra os comentários obtidos para issues de uma página (todas ou parte delas)"""
+        self.append({'type': 'notes', 'page': page,
+                     'comments': {str(issue['id']): issue['comments'] for issue in issues}})
+
+    def remove(self):
+        """Apaga o journal de uma extração concluída"""
+        if self.path.exists():
+            self.path.unlink()
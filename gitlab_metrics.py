@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Métricas da execução
+Registro de cada requisição (endpoint, status, latência, bytes, retentativas, folga de rate limit)
+e da duração de cada fase, agregados em percentis e gravados em JSON ou no formato textfile do Prometheus
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from urllib.parse import urlparse
+
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile_summary(values):
+    """count, média, p50/p90/p95/p99 (nearest-rank) e máximo de uma lista de segundos, em ms"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    summary = {'count': len(ordered), 'mean': sum(ordered) / len(ordered) * 1000}
+    for p in PERCENTILES:
+        rank = max(1, -(-p * len(ordered) // 100))
+        summary[f"p{p}"] = ordered[rank - 1] * 1000
+    summary['max'] = ordered[-1] * 1000
+    return {key: round(value, 2) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+def endpoint_template(url):
+    """Caminho da URL sem identificadores: /api/v4/projects/:id/issues/:iid/notes"""
+    path = urlparse(url).path or '/'
+    path = re.sub(r'/(projects|groups)/[^/]+', r'/\1/:id', path)
+    path = re.sub(r'^/.+?/-/', '/:project/-/', path)
+    return re.sub(r'/\d+(?=/|$)', '/:iid', path)
+
+
+def request_phase(endpoint):
+    """Fase da extração a que pertence uma requisição: list, notes, graphql ou other"""
+    if endpoint.endswith('/notes'):
+        return 'notes'
+    if endpoint.endswith('/issues'):
+        return 'list'
+    if endpoint.endswith('/graphql'):
+        return 'graphql'
+    return 'other'
+
+
+class RequestStats:
+    """Amostras acumuladas das requisições de um endpoint ou de uma fase"""
+
+    def __init__(self):
+        self.latencies = []
+        self.durations = []
+        self.statuses = Counter()
+        self.retries = 0
+        self.bytes = 0
+        self.min_remaining = None
+
+    def add(self, status, latency, duration, size, retries, remaining):
+        self.latencies.append(latency)
+        self.durations.append(duration)
+        self.statuses[str(status)] += 1
+        self.retries += retries
+        self.bytes += size
+        if remaining is not None:
+            self.min_remaining = remaining if self.min_remaining is None else min(self.min_remaining, remaining)
+
+    def report(self):
+        errors = sum(count for status, count in self.statuses.items() if not status.startswith(('2', '3')))
+        return {
+            'requests': len(self.durations),
+            'errors': errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'total_s': round(sum(self.durations), 3),
+            'status': dict(self.statuses),
+            'rate_limit_min_remaining': self.min_remaining,
+            'latency_ms': percentile_summary(self.latencies),
+            'duration_ms': percentile_summary(self.durations)
+        }
+
+
+class RunMetrics:
+    """Métricas de uma execução, thread-safe
+
+    A GitLabSession chama record_request a cada requisição lógica: `latency` é o tempo
+    da última tentativa até a resposta, `duration` inclui retentativas e esperas do
+    rate limiter. As requisições são agregadas por endpoint e por fase (list, notes);
+    fases locais (filtro, cada save_*) são cronometradas com `with metrics.phase(nome)`.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        self.endpoints = defaultdict(RequestStats)
+        self.request_phases = defaultdict(RequestStats)
+        self.phases = defaultdict(list)
+        # PhaseProfiler opcional (gitlab_profiling): as mesmas fases ganham perfil e pico de memória
+        self.profiler = None
+
+    def record_request(self, method, url, status, latency, duration, size=0, retries=0, remaining=None):
+        endpoint = endpoint_template(url)
+        try:
+            remaining = int(remaining) if remaining is not None else None
+        except ValueError:
+            remaining = None
+        with self.lock:
+            self.endpoints[f"{method.upper()} {endpoint}"].add(status, latency, duration, size, retries, remaining)
+            self.request_phases[request_phase(endpoint)].add(status, latency, duration, size, retries, remaining)
+
+    def record_phase(self, name, seconds):
+        with self.lock:
+            self.phases[name].append(seconds)
+
+    @contextmanager
+    def phase(self, name):
+        """Cronometra um trecho local da execução (filtro, gravação de um formato...)"""
+        with self.profiler.phase(name) if self.profiler else nullcontext():
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.record_phase(name, time.perf_counter() - started)
+
+    def report(self):
+        """Relatório agregado: totais, por endpoint e por fase"""
+        with self.lock:
+            total = RequestStats()
+            for stats in self.endpoints.values():
+                total.latencies.extend(stats.latencies)
+                total.durations.extend(stats.durations)
+                total.statuses.update(stats.statuses)
+                total.retries += stats.retries
+                total.bytes += stats.bytes
+                if stats.min_remaining is not None:
+                    total.min_remaining = (stats.min_remaining if total.min_remaining is None
+                                           else min(total.min_remaining, stats.min_remaining))
+            phases = {name: stats.report() for name, stats in self.request_phases.items()}
+            for name, samples in self.phases.items():
+                phases[name] = {'count': len(samples), 'total_s': round(sum(samples), 3),
+                                'duration_ms': percentile_summary(samples)}
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'wall_time_s': round(time.time() - self.started_at, 3),
+                'requests': total.report(),
+                'endpoints': {name: stats.report() for name, stats in sorted(self.endpoints.items())},
+                'phases': phases
+            }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return str(path)
+
+    def write_prometheus(self, path):
+        """Grava o formato textfile do node_exporter (arquivo temporário + rename, atômico)"""
+        report = self.report()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{prometheus_escape(str(val))}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        endpoints = report['endpoints']
+        metric('gitlab_export_requests_total', 'counter', 'Requisições à API por endpoint e status',
+               [({'endpoint': name, 'status': status}, count)
+                for name, stats in endpoints.items() for status, count in stats['status'].items()])
+        metric('gitlab_export_request_retries_total', 'counter', 'Retentativas por endpoint',
+               [({'endpoint': name}, stats['retries']) for name, stats in endpoints.items()])
+        metric('gitlab_export_response_bytes_total', 'counter', 'Bytes recebidos por endpoint',
+               [({'endpoint': name}, stats['bytes']) for name, stats in endpoints.items()])
+        metric('gitlab_export_rate_limit_remaining_min', 'gauge', 'Menor RateLimit-Remaining observado por endpoint',
+               [({'endpoint': name}, stats['rate_limit_min_remaining']) for name, stats in endpoints.items()
+                if stats['rate_limit_min_remaining'] is not None])
+        metric('gitlab_export_request_duration_seconds', 'summary',
+               'Duração das requisições (com retentativas) por endpoint',
+               [({'endpoint': name, 'quantile': p / 100}, round(stats['duration_ms'][f"p{p}"] / 1000, 6))
+                for name, stats in endpoints.items() if stats['requests'] for p in PERCENTILES])
+        for name, stats in endpoints.items():
+            label = prometheus_escape(name)
+            lines.append(f'gitlab_export_request_duration_seconds_sum{{endpoint="{label}"}} {stats["total_s"]}')
+            lines.append(f'gitlab_export_request_duration_seconds_count{{endpoint="{label}"}} {stats["requests"]}')
+        metric('gitlab_export_phase_duration_seconds', 'gauge', 'Tempo acumulado de cada fase (requisições concorrentes somadas)',
+               [({'phase': name}, stats['total_s']) for name, stats in report['phases'].items()])
+        metric('gitlab_export_wall_time_seconds', 'gauge', 'Duração da execução', [({}, report['wall_time_s'])])
+        metric('gitlab_export_last_run_timestamp_seconds', 'gauge', 'Momento do fim da execução',
+               [({}, int(time.time()))])
+
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temporary, path)
+        return str(path)
+
+
+def prometheus_escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_metrics_summary(report):
+    """Linhas de resumo por fase de requisições: contagem, p50/p95 e erros"""
+    lines = []
+    for name, stats in report['phases'].items():
+        if 'requests' in stats:
+            duration = stats['duration_ms']
+            lines.append(f"[MÉTRICAS] {name}: {stats['requests']} requisições, p50 {duration['p50']:.0f} ms, "
+                         f"p95 {duration['p95']:.0f} ms, {stats['retries']} retentativas, {stats['errors']} erros")
+        else:
+            lines.append(f"[MÉTRICAS] {name}: {stats['count']}x, {stats['total_s']:.2f}s")
+    return lines
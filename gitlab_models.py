@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Modelo de dados
+Issues e comentários normalizados em objetos com __slots__, convertidos para dict só na serialização
+"""
+
+import sys
+
+
+def intern_text(value):
+    """Interna strings repetidas (estado, autor, labels) para compartilhar uma única cópia"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """Registro com __slots__ e acesso por chave, compatível com o código que lia dicts
+
+    issue['title'], issue.get('labels', []) e issue['comments'] = [...] continuam
+    funcionando; to_dict() devolve os campos na ordem de __slots__.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def keys(self):
+        return self.__slots__
+
+    def get(self, name, default=None):
+        return getattr(self, name) if name in self.__slots__ else default
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name, value):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return name in self.__slots__
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.get('id')!r})"
+
+
+class Comment(Record):
+    """Comentário (nota de usuário) de uma issue"""
+
+    __slots__ = ('id', 'body', 'author', 'author_username', 'created_at', 'updated_at', 'resolvable', 'resolved')
+
+
+class Issue(Record):
+    """Issue normalizada, com os campos e a ordem do JSON de saída"""
+
+    __slots__ = (
+        'id', 'iid', 'title', 'description', 'state', 'created_at', 'updated_at', 'closed_at', 'labels',
+        'milestone', 'assignees', 'author', 'author_username', 'web_url', 'references', 'time_stats',
+        'confidential', 'discussion_locked', 'due_date', 'has_tasks', 'task_status', 'weight',
+        'user_notes_count', 'merge_requests_count', 'upvotes', 'downvotes', 'comments'
+    )
+
+    @classmethod
+    def from_dict(cls, data):
+        issue = cls(**data)
+        issue.comments = [Comment.from_dict(comment) if isinstance(comment, dict) else comment
+                          for comment in (data.get('comments') or [])]
+        return issue
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['comments'] = [comment.to_dict() if isinstance(comment, Record) else comment
+                            for comment in (self.comments or [])]
+        return data
+
+
+def to_serializable(value):
+    """Hook `default` do json.dump(s) para Issue e Comment"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Objeto do tipo {type(value).__name__} não é serializável em JSON")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Modo de profiling
+Perfis cProfile por fase (extração, filtro, cada save_*, print_summary) e pico de memória
+por fase com tracemalloc, gravados num diretório para análise com pstats/snakeviz
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class PhaseProfiler:
+    """Profiler determinístico dividido por fases
+
+    Cada fase tem seu próprio cProfile.Profile; entrar em uma fase aninhada pausa o
+    perfil da fase externa, então cada arquivo mostra só o tempo próprio da fase
+    (o filtro não aparece dentro da extração). Só a thread que criou o profiler é
+    perfilada: nas fases abertas por workers o tempo de rede aparece, na thread
+    principal, como espera pelos futures.
+
+    Com tracemalloc, cada fase registra o pico de memória alocada (o pico de uma
+    fase aninhada também conta para a externa) e, na ocorrência de maior pico, um
+    snapshot das linhas que mais retêm memória ao final da fase.
+    """
+
+    def __init__(self, directory, trace_memory=True, top=30):
+        self.directory = Path(directory)
+        self.top = top
+        self.thread = threading.get_ident()
+        self.profiles = {}
+        self.memory = {}
+        self.snapshots = {}
+        self.stack = []
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name):
+        if threading.get_ident() != self.thread:
+            yield
+            return
+
+        if self.stack:
+            self.stack[-1]['profile'].disable()
+            self.update_peak(self.stack[-1])
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        entry = {'name': name, 'profile': profile, 'peak': 0, 'started': time.perf_counter()}
+        self.stack.append(entry)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.stack.pop()
+            self.finish_memory(entry)
+            if self.stack:
+                self.stack[-1]['peak'] = max(self.stack[-1]['peak'], entry['peak'])
+                self.stack[-1]['profile'].enable()
+
+    def update_peak(self, entry):
+        """Acumula o pico desde a última leitura e zera o pico do tracemalloc (Python 3.9+)"""
+        if not self.trace_memory:
+            return
+        entry['peak'] = max(entry['peak'], tracemalloc.get_traced_memory()[1])
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    def finish_memory(self, entry):
+        self.update_peak(entry)
+        stats = self.memory.setdefault(entry['name'], {'count': 0, 'seconds': 0.0, 'peak': 0,
+                                                       'current': 0})
+        stats['count'] += 1
+        stats['seconds'] += time.perf_counter() - entry['started']
+        if not self.trace_memory:
+            return
+        stats['current'] = tracemalloc.get_traced_memory()[0]
+        # Snapshot só das fases externas e só quando o pico supera o das ocorrências anteriores
+        if entry['peak'] > stats['peak'] and not self.stack:
+            self.snapshots[entry['name']] = tracemalloc.take_snapshot()
+        stats['peak'] = max(stats['peak'], entry['peak'])
+
+    def write(self):
+        """Grava <fase>.prof (pstats), <fase>.txt (top por tempo acumulado) e memory.txt; devolve o diretório"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, profile in self.profiles.items():
+            profile.dump_stats(str(self.directory / f"{name}.prof"))
+            output = io.StringIO()
+            stats = pstats.Stats(profile, stream=output)
+            stats.sort_stats('cumulative').print_stats(self.top)
+            (self.directory / f"{name}.txt").write_text(output.getvalue(), encoding='utf-8')
+
+        lines = [f"{'Fase':<24}{'Vezes':>7}{'Tempo (s)':>11}{'Pico (MiB)':>12}{'Retida ao fim (MiB)':>21}"]
+        for name, stats in self.memory.items():
+            lines.append(f"{name:<24}{stats['count']:>7}{stats['seconds']:>11.2f}"
+                         f"{stats['peak'] / 2 ** 20:>12.1f}{stats['current'] / 2 ** 20:>21.1f}")
+        for name, snapshot in self.snapshots.items():
+            lines.append(f"\n== {name}: linhas que mais retêm memória ao final da fase ==")
+            for statistic in snapshot.statistics('lineno')[:self.top]:
+                lines.append(str(statistic))
+        (self.directory / 'memory.txt').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+        if self.trace_memory:
+            tracemalloc.stop()
+        return str(self.directory)
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+GitLab Issues Extractor - Gravação dos formatos de saída
+Sinks por formato (JSON, JSON Lines, CSV, Markdown, resumo) alimentados por uma única passada pelas
+issues, e leitura dos arquivos JSON / JSON Lines gerados
+"""
+
+import csv
+import gzip
+import io
+import json
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+from gitlab_models import to_serializable
+
+
+# Compressões aceitas no formato ndjson e o sufixo acrescentado ao arquivo
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def open_text_file(path, mode='r'):
+    """Abre um arquivo texto UTF-8, comprimido com gzip (.gz) ou zstd (.zst) conforme a extensão
+
+    zstd requer o pacote opcional 'zstandard' (pip install zstandard).
+    """
+    path = str(path)
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Arquivos .zst requerem o pacote 'zstandard' (pip install zstandard)")
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def is_ndjson_file(path):
+    name = str(path)
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name.endswith(('.ndjson', '.jsonl'))
+
+
+def iter_issues_file(path):
+    """Itera as issues de um arquivo JSON Lines (.ndjson, .ndjson.gz, .ndjson.zst) sem carregá-lo inteiro
+
+    Uma última linha incompleta (arquivo ainda sendo gravado por --stream) é ignorada,
+    assim como o fim truncado de um arquivo comprimido.
+    """
+    with open_text_file(path) as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    if line.endswith('\n'):
+                        raise
+                    return
+        except EOFError:
+            return
+
+
+def load_issues_file(path):
+    """Lista de issues de um arquivo JSON (array) ou JSON Lines"""
+    if is_ndjson_file(path):
+        return list(iter_issues_file(path))
+    with open_text_file(path) as f:
+        return json.load(f)
+
+
+class IssueSink:
+    """Destino de um formato: open(total), write(issue) para cada issue e close(), que devolve o caminho
+
+    `phase` é o nome usado nas métricas da execução; `seconds` acumula o tempo gasto
+    pelo sink (abertura, escrita de cada issue e fechamento). Com um PhaseProfiler em
+    `profiler`, esse trabalho é perfilado como a fase `phase`.
+    """
+
+    format = None
+    phase = None
+    description = None
+    saved_message = None
+    newline = None
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.file = None
+        self.total = None
+        self.count = 0
+        self.seconds = 0.0
+        self.profiler = None
+
+    def profiled(self):
+        return self.profiler.phase(self.phase) if self.profiler else nullcontext()
+
+    def open(self, total=None):
+        with self.profiled():
+            started = time.perf_counter()
+            self.total = total
+            self.file = open(self.filepath, 'w', encoding='utf-8', newline=self.newline)
+            self.start()
+            self.seconds += time.perf_counter() - started
+
+    def feed(self, issue):
+        with self.profiled():
+            started = time.perf_counter()
+            self.write(issue)
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+    def close(self):
+        with self.profiled():
+            started = time.perf_counter()
+            self.finish()
+            self.file.close()
+            self.seconds += time.perf_counter() - started
+        return str(self.filepath)
+
+    def abort(self):
+        if self.file is not None and not self.file.closed:
+            self.file.close()
+
+    def start(self):
+        pass
+
+    def write(self, issue):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+
+class JSONSink(IssueSink):
+    """Lista JSON com indentação 2, idêntica a json.dump(issues, indent=2), gravada issue a issue"""
+
+    format = 'json'
+    phase = 'save_to_json'
+    description = 'arquivo JSON'
+    saved_message = 'Dados JSON salvos em'
+
+    def write(self, issue):
+        item = json.dumps(issue, indent=2, ensure_ascii=False, default=to_serializable).replace('\n', '\n  ')
+        self.file.write(('[\n  ' if self.count == 0 else ',\n  ') + item)
+
+    def finish(self):
+        self.file.write('\n]' if self.count else '[]')
+
+
+class NDJSONSink(IssueSink):
+    """JSON Lines: uma issue compacta por linha, opcionalmente comprimida (gzip/zstd, pela extensão)
+
+    O arquivo é descarregado a cada `flush_every` issues, então leitores que acompanham
+    a gravação (tail -f, iter_issues_file) veem as issues já extraídas.
+    """
+
+    format = 'ndjson'
+    phase = 'save_to_ndjson'
+    description = 'arquivo JSON Lines'
+    saved_message = 'Dados JSON Lines salvos em'
+
+    def __init__(self, filepath, flush_every=100):
+        super().__init__(filepath)
+        self.flush_every = flush_every
+
+    def open(self, total=None):
+        with self.profiled():
+            started = time.perf_counter()
+            self.total = total
+            self.file = open_text_file(self.filepath, 'w')
+            self.seconds += time.perf_counter() - started
+
+    def write(self, issue):
+        self.file.write(json.dumps(issue, ensure_ascii=False, separators=(',', ':'), default=to_serializable) + '\n')
+        if (self.count + 1) % self.flush_every == 0:
+            self.file.flush()
+
+
+class CSVSink(IssueSink):
+    """CSV com uma linha por issue (`build_row` converte a issue normalizada)"""
+
+    format = 'csv'
+    phase = 'save_to_csv'
+    description = 'arquivo CSV'
+    saved_message = 'Dados CSV salvos em'
+    newline = ''
+
+    def __init__(self, filepath, fieldnames, build_row):
+        super().__init__(filepath)
+        self.fieldnames = fieldnames
+        self.build_row = build_row
+        self.writer = None
+
+    def start(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+        self.writer.writeheader()
+
+    def write(self, issue):
+        self.writer.writerow(self.build_row(issue))
+
+
+class MarkdownSink(IssueSink):
+    """Relatório Markdown detalhado (`write_issue` escreve a seção de cada issue)
+
+    Sem o total antecipado (issues vindas de um gerador), o cabeçalho reserva
+    espaço e o total é preenchido ao final.
+    """
+
+    format = 'markdown'
+    phase = 'save_to_markdown'
+    description = 'arquivo Markdown'
+    saved_message = 'Relatório Markdown salvo em'
+
+    def __init__(self, filepath, write_issue):
+        super().__init__(filepath)
+        self.write_issue = write_issue
+        self.total_position = None
+
+    def start(self):
+        self.file.write(f"# Issues do GitLab - Relatório Detalhado\n\n")
+        self.file.write(f"**Data da extração:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        if self.total is not None:
+            self.file.write(f"**Total de issues:** {self.total}\n\n")
+        else:
+            self.total_position = self.file.tell()
+            self.file.write(f"**Total de issues:** {'':<12}\n\n")
+
+    def write(self, issue):
+        self.write_issue(self.file, issue)
+
+    def finish(self):
+        if self.total_position is not None:
+            self.file.seek(self.total_position)
+            self.file.write(f"**Total de issues:** {self.count:<12}")
+
+
+class SummarySink(IssueSink):
+    """Relatório resumido: estatísticas e lista das issues por data de criação (mais recentes primeiro)
+
+    As estatísticas são contadas e a entrada de cada issue é renderizada à medida que
+    as issues chegam; o arquivo é escrito no fechamento. A ordenação só acontece se
+    as issues não vierem já em ordem decrescente de created_at (a ordem da API).
+    """
+
+    format = 'summary'
+    phase = 'save_summary_report'
+    description = 'relatório resumido'
+    saved_message = 'Relatório resumido salvo em'
+
+    def __init__(self, filepath):
+        super().__init__(filepath)
+        self.states = {}
+        self.authors = {}
+        self.labels = {}
+        self.entries = []
+        self.ordered = True
+
+    def open(self, total=None):
+        # O arquivo só é aberto no fechamento, com todas as estatísticas
+        self.total = total
+
+    def write(self, issue):
+        self.states[issue['state']] = self.states.get(issue['state'], 0) + 1
+        self.authors[issue['author']] = self.authors.get(issue['author'], 0) + 1
+        for label in issue['labels']:
+            self.labels[label] = self.labels.get(label, 0) + 1
+
+        if self.entries and issue['created_at'] > self.entries[-1][0]:
+            self.ordered = False
+        self.entries.append((issue['created_at'], self.render_entry(issue)))
+
+    def render_entry(self, issue):
+        lines = [
+            f"**📌 Título:** {issue['title']}\n",
+            f"**👤 Autor:** {issue['author']} (@{issue['author_username']})\n",
+            f"**📅 Criado:** {issue['created_at'][:10]} às {issue['created_at'][11:19]}\n",
+            f"**🔗 URL:** {issue['web_url']}\n",
+            f"**⚡ Estado:** {issue['state'].upper()}\n"
+        ]
+        if issue['labels']:
+            lines.append(f"**🏷️ Labels:** {', '.join(issue['labels'])}\n")
+
+        # Descrição resumida
+        if issue['description']:
+            desc = issue['description'].replace('\n', ' ').strip()
+            if len(desc) > 150:
+                desc = desc[:150] + "..."
+            lines.append(f"**📝 Descrição:** {desc}\n")
+        return f"Issue #{issue['iid']}\n\n" + ''.join(lines) + "\n---\n\n"
+
+    def close(self):
+        with self.profiled():
+            self.write_report()
+        return str(self.filepath)
+
+    def write_report(self):
+        started = time.perf_counter()
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            f.write("# Relatório Resumido - Issues do GitLab\n\n")
+            f.write(f"**Data da extração:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"**Total de issues:** {self.count}\n\n")
+
+            # Estatísticas gerais
+            f.write("## Estatísticas Gerais\n\n")
+
+            f.write("### Por Estado\n")
+            for state, count in self.states.items():
+                f.write(f"- **{state.title()}:** {count} issues\n")
+            f.write("\n")
+
+            f.write("### Top Autores\n")
+            top_authors = sorted(self.authors.items(), key=lambda x: x[1], reverse=True)
+            for author, count in top_authors[:10]:
+                f.write(f"- **{author}:** {count} issues\n")
+            f.write("\n")
+
+            if self.labels:
+                f.write("### Labels Mais Comuns\n")
+                top_labels = sorted(self.labels.items(), key=lambda x: x[1], reverse=True)
+                for label, count in top_labels[:20]:
+                    f.write(f"- **{label}:** {count} issues\n")
+                f.write("\n")
+
+            # Lista resumida das issues
+            f.write("## 📋 Lista Resumida das Issues\n\n")
+            entries = self.entries if self.ordered else sorted(self.entries, key=lambda x: x[0], reverse=True)
+            for i, (_, entry) in enumerate(entries, 1):
+                f.write(f"### {i}. {entry}")
+        self.seconds += time.perf_counter() - started
+
+
+# Marca o fim das issues na fila de cada sink em modo com threads
+END_OF_ISSUES = object()
+
+
+def feed_sink_thread(sink, issues_queue, errors):
+    """Consome a fila de um sink até END_OF_ISSUES; depois de um erro só drena a fila"""
+    while True:
+        issue = issues_queue.get()
+        if issue is END_OF_ISSUES:
+            return
+        if sink in errors:
+            continue
+        try:
+            sink.feed(issue)
+        except Exception as e:
+            errors[sink] = e
+
+
+def fan_out(issues, sinks, threaded=False, queue_size=256):
+    """Percorre `issues` (lista ou gerador) uma única vez alimentando todos os sinks
+
+    Com threaded=True cada sink roda em sua própria thread, alimentada por uma fila
+    limitada, e a escrita de um formato se sobrepõe à dos outros e à extração. A falha
+    de um sink não interrompe os demais. Devolve {sink: caminho gravado ou None}.
+    """
+    total = len(issues) if hasattr(issues, '__len__') else None
+    errors = {}
+    for sink in sinks:
+        try:
+            sink.open(total)
+        except Exception as e:
+            errors[sink] = e
+
+    try:
+        if threaded:
+            queues = {sink: queue.Queue(maxsize=queue_size) for sink in sinks if sink not in errors}
+            threads = [threading.Thread(target=feed_sink_thread, args=(sink, issues_queue, errors), daemon=True)
+                       for sink, issues_queue in queues.items()]
+            for thread in threads:
+                thread.start()
+            try:
+                for issue in issues:
+                    for issues_queue in queues.values():
+                        issues_queue.put(issue)
+            finally:
+                for issues_queue in queues.values():
+                    issues_queue.put(END_OF_ISSUES)
+                for thread in threads:
+                    thread.join()
+        else:
+            for issue in issues:
+                for sink in sinks:
+                    if sink in errors:
+                        continue
+                    try:
+                        sink.feed(issue)
+                    except Exception as e:
+                        errors[sink] = e
+    except Exception as e:
+        # Falha ao produzir as issues (ex.: gerador da extração): nenhum arquivo fica completo
+        for sink in sinks:
+            errors.setdefault(sink, e)
+
+    results = {}
+    for sink in sinks:
+        if sink not in errors:
+            try:
+                results[sink] = sink.close()
+                print(f"[OK] {sink.saved_message}: {results[sink]}")
+                continue
+            except Exception as e:
+                errors[sink] = e
+        sink.abort()
+        results[sink] = None
+        print(f"[ERRO] Erro ao salvar {sink.description}: {errors[sink]}")
+    return results
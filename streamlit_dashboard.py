@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import json
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -10,6 +9,8 @@ import glob
 from pathlib import Path
 import time
 
+from gitlab_writers import load_issues_file
+
 # Configuração da página
 st.set_page_config(
     page_title="GitLab Issues Dashboard",
@@ -51,25 +52,29 @@ class GitLabDashboard:
     def ensure_reports_dir(self):
         """Garante que o diretório de relatórios existe"""
         self.reports_dir.mkdir(exist_ok=True)
-        for subdir in ["json", "csv", "markdown", "summary"]:
+        for subdir in ["json", "ndjson", "csv", "markdown", "summary"]:
             (self.reports_dir / subdir).mkdir(exist_ok=True)
     
+    def list_data_files(self):
+        """Arquivos de dados das extrações: JSON e JSON Lines (.ndjson, .ndjson.gz, .ndjson.zst)"""
+        return (list((self.reports_dir / "json").glob("*.json")) +
+                list((self.reports_dir / "ndjson").glob("*.ndjson*")))
+    
     def get_latest_json_file(self):
-        """Encontra o arquivo JSON mais recente"""
-        json_files = list((self.reports_dir / "json").glob("*.json"))
+        """Encontra o arquivo de dados mais recente (JSON ou JSON Lines)"""
+        json_files = self.list_data_files()
         if json_files:
             return max(json_files, key=os.path.getctime)
         return None
     
     def load_data(self, file_path=None):
-        """Carrega dados do arquivo JSON"""
+        """Carrega dados do arquivo JSON ou JSON Lines"""
         if file_path is None:
             file_path = self.get_latest_json_file()
         
         if file_path and file_path.exists():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = load_issues_file(file_path)
                 
                 # Converter para DataFrame
                 df = pd.DataFrame(data)
@@ -138,7 +143,7 @@ def main():
         with st.expander("Configurar Extração", expanded=False):
             output_format = st.selectbox(
                 "Formato de Saída",
-                ["json,summary", "all", "json", "csv", "markdown", "summary"],
+                ["json,summary", "all", "json", "ndjson", "csv", "markdown", "summary"],
                 help="Escolha quais formatos de arquivo gerar"
             )
             
@@ -193,7 +198,7 @@ def main():
         # Seção de arquivos
         st.subheader("📁 Arquivos Disponíveis")
         
-        json_files = list((dashboard.reports_dir / "json").glob("*.json"))
+        json_files = dashboard.list_data_files()
         if json_files:
             # Ordenar por data de modificação (mais recente primeiro)
             json_files.sort(key=os.path.getctime, reverse=True)